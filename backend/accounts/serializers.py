@@ -4,21 +4,22 @@ Authentication serializers for registration and login.
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 
 User = get_user_model()
 
 
 class RegisterSerializer(serializers.Serializer):
-    """Serializer for user registration."""
+    """
+    Serializer for user registration.
+    
+    Email uniqueness is enforced by the database constraint rather than a
+    pre-check query, so the happy path costs a single INSERT.
+    """
     email = serializers.EmailField()
     password = serializers.CharField(min_length=8, write_only=True)
     confirm_password = serializers.CharField(min_length=8, write_only=True)
     
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Email already registered")
-        return value
-    
     def validate(self, data):
         if data['password'] != data['confirm_password']:
             raise serializers.ValidationError({"confirm_password": "Passwords do not match"})
@@ -26,7 +27,11 @@ class RegisterSerializer(serializers.Serializer):
     
     def create(self, validated_data):
         validated_data.pop('confirm_password')
-        return User.objects.create_user(**validated_data)
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(**validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({"email": ["Email already registered"]})
 
 
 class UserSerializer(serializers.ModelSerializer):
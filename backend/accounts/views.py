@@ -4,6 +4,7 @@ Login is handled by simplejwt's TokenObtainPairView.
 """
 
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from adrf.views import APIView
@@ -12,6 +13,15 @@ from asgiref.sync import sync_to_async
 from accounts.serializers import RegisterSerializer, UserSerializer
 
 
+def _register_sync(data):
+    """Validate, create and serialize a new user (runs in a worker thread)."""
+    serializer = RegisterSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    # Duplicate emails raise ValidationError from the unique constraint on save
+    user = serializer.save()
+    return UserSerializer(user).data
+
+
 class RegisterView(APIView):
     """
     User registration endpoint.
@@ -26,25 +36,19 @@ class RegisterView(APIView):
     permission_classes = [AllowAny]
     
     async def post(self, request):
-        serializer = RegisterSerializer(data=request.data)
-        
-        # Wrap validation and save in sync_to_async
-        is_valid = await sync_to_async(serializer.is_valid)()
-        
-        if is_valid:
-            user = await sync_to_async(serializer.save)()
-            user_data = await sync_to_async(lambda: UserSerializer(user).data)()
-            
+        # Validate, save and serialize in a single threadpool hop
+        try:
+            user_data = await sync_to_async(_register_sync, thread_sensitive=True)(request.data)
+        except ValidationError as e:
             return Response(
-                {
-                    "message": "Registration successful",
-                    "user": user_data
-                },
-                status=status.HTTP_201_CREATED
+                {"error": "Registration failed", "detail": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
             )
         
-        errors = await sync_to_async(lambda: serializer.errors)()
         return Response(
-            {"error": "Registration failed", "detail": errors},
-            status=status.HTTP_400_BAD_REQUEST
+            {
+                "message": "Registration successful",
+                "user": user_data
+            },
+            status=status.HTTP_201_CREATED
         )
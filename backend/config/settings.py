@@ -93,6 +93,25 @@ DATABASES['default']['CONN_MAX_AGE'] = 0  # Close connections after each request
 DATABASES['default']['CONN_HEALTH_CHECKS'] = True  # Verify connection before use
 
 
+# Cache: Redis when REDIS_URL is set (configure maxmemory-policy allkeys-lru),
+# per-process in-memory cache otherwise
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -175,6 +194,21 @@ OCR_CONFIDENCE_THRESHOLD = float(os.getenv('OCR_CONFIDENCE_THRESHOLD', '50'))
 # RAG Settings
 RAG_SIMILARITY_THRESHOLD = float(os.getenv('RAG_SIMILARITY_THRESHOLD', '0.25'))
 RAG_TOP_K = int(os.getenv('RAG_TOP_K', '8'))
+# Server-side PREPARE for the vector search. Only enable with persistent
+# connections (CONN_MAX_AGE > 0) and no transaction-mode pooler (PgBouncer,
+# Neon's -pooler endpoint), since prepared statements are per backend session.
+RAG_PREPARED_SEARCH = os.getenv('RAG_PREPARED_SEARCH', 'False').lower() == 'true'
+# Load the embedding model, tiktoken and Tesseract in AppConfig.ready() instead
+# of on the first request. Off by default so tests and management commands
+# start fast; the server process enables it.
+RAG_WARMUP_MODELS = os.getenv('RAG_WARMUP_MODELS', 'False').lower() == 'true'
+# Texts per embedding forward pass on upload (raise to ~128 on GPU)
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '32'))
+# Rows per INSERT when storing document chunks
+CHUNK_INSERT_BATCH_SIZE = int(os.getenv('CHUNK_INSERT_BATCH_SIZE', '500'))
+# Respond 202 to uploads and process them in a background task on the same
+# event loop. Assets report status processing/ready/failed while this runs.
+RAG_BACKGROUND_UPLOADS = os.getenv('RAG_BACKGROUND_UPLOADS', 'False').lower() == 'true'
 
 
 # Static files (CSS, JavaScript, Images)
@@ -3,19 +3,54 @@ Django Admin configuration for RAG app.
 """
 
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Count, F, Func, IntegerField, Prefetch
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from rag.models import Asset, DocumentChunk, ChatSession, ChatMessage
 
 
+class FasterAdminPaginator(Paginator):
+    """
+    Paginator that uses Postgres' planner estimate for unfiltered changelists.
+    
+    Avoids a full SELECT COUNT(*) on large tables; falls back to an exact
+    count when filters/search are applied or the table has not been analyzed.
+    """
+    
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where:
+            return super().count
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [query.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        
+        # reltuples is -1 (or 0) until the table has been vacuumed/analyzed
+        if not row or row[0] <= 0:
+            return super().count
+        return row[0]
+
+
 @admin.register(Asset)
 class AssetAdmin(admin.ModelAdmin):
     """Admin for Asset model."""
     
-    list_display = ('id', 'original_filename', 'asset_type', 'user_email', 'cloudinary_link', 'chunks_count', 'created_at')
-    list_filter = ('asset_type', 'created_at')
+    list_display = ('id', 'original_filename', 'asset_type', 'user_email', 'cloudinary_link', 'chunks_count', 'status', 'created_at')
+    list_filter = ('asset_type', 'status', 'created_at')
     search_fields = ('original_filename', 'user__email', 'cloudinary_public_id')
     ordering = ('-created_at',)
     readonly_fields = ('id', 'created_at', 'cloudinary_url', 'cloudinary_public_id', 'cloudinary_preview')
+    list_select_related = ('user',)
+    list_per_page = 25
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Basic Info', {
@@ -29,6 +64,10 @@ class AssetAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # Count chunks in the changelist query instead of once per row
+        return super().get_queryset(request).annotate(_chunks_count=Count('chunks'))
+    
     def user_email(self, obj):
         return obj.user.email
     user_email.short_description = 'User'
@@ -40,13 +79,19 @@ class AssetAdmin(admin.ModelAdmin):
     
     def cloudinary_preview(self, obj):
         if obj.asset_type == 'image':
-            return format_html('<img src="{}" style="max-width: 300px; max-height: 300px;" />', obj.cloudinary_url)
+            # Let Cloudinary serve a pre-scaled, auto-format thumbnail
+            thumbnail_url = obj.cloudinary_url.replace('/upload/', '/upload/w_300,h_300,c_limit,q_auto,f_auto/', 1)
+            return format_html(
+                '<img src="{}" loading="lazy" decoding="async" style="max-width: 300px; max-height: 300px;" />',
+                thumbnail_url
+            )
         return format_html('<a href="{}" target="_blank">{}</a>', obj.cloudinary_url, obj.cloudinary_url)
     cloudinary_preview.short_description = 'Preview'
     
     def chunks_count(self, obj):
-        return obj.chunks.count()
+        return obj._chunks_count
     chunks_count.short_description = 'Chunks'
+    chunks_count.admin_order_field = '_chunks_count'
 
 
 @admin.register(DocumentChunk)
@@ -58,6 +103,10 @@ class DocumentChunkAdmin(admin.ModelAdmin):
     search_fields = ('user_id', 'content', 'asset__original_filename')
     ordering = ('-created_at',)
     readonly_fields = ('id', 'user_id', 'document_id', 'created_at', 'embedding_dimension')
+    list_select_related = ('asset',)
+    list_per_page = 25
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Basic Info', {
@@ -75,6 +124,12 @@ class DocumentChunkAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # The embedding is never rendered; compute its dimension in SQL and keep the vector deferred
+        return super().get_queryset(request).defer('embedding').annotate(
+            _embedding_dims=Func(F('embedding'), function='vector_dims', output_field=IntegerField())
+        )
+    
     def asset_filename(self, obj):
         return obj.asset.original_filename if obj.asset else '-'
     asset_filename.short_description = 'Asset'
@@ -85,7 +140,7 @@ class DocumentChunkAdmin(admin.ModelAdmin):
     content_preview.short_description = 'Content Preview'
     
     def embedding_dimension(self, obj):
-        return f"{len(obj.embedding)} dimensions" if obj.embedding else 'No embedding'
+        return f"{obj._embedding_dims} dimensions" if obj._embedding_dims else 'No embedding'
     embedding_dimension.short_description = 'Embedding'
 
 
@@ -98,6 +153,7 @@ class ChatSessionAdmin(admin.ModelAdmin):
     search_fields = ('user__email', 'messages__content')
     ordering = ('-updated_at',)
     readonly_fields = ('id', 'created_at', 'updated_at')
+    list_select_related = ('user',)
     
     fieldsets = (
         ('Basic Info', {
@@ -108,17 +164,30 @@ class ChatSessionAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # Annotate counts and prefetch the latest message in bulk to avoid N+1 queries
+        return super().get_queryset(request).annotate(
+            _message_count=Count('messages')
+        ).prefetch_related(
+            Prefetch(
+                'messages',
+                queryset=ChatMessage.objects.order_by('-created_at')[:1],
+                to_attr='_latest'
+            )
+        )
+    
     def user_email(self, obj):
         return obj.user.email
     user_email.short_description = 'User'
     user_email.admin_order_field = 'user__email'
     
     def message_count(self, obj):
-        return obj.messages.count()
+        return obj._message_count
     message_count.short_description = 'Messages'
+    message_count.admin_order_field = '_message_count'
     
     def last_message_preview(self, obj):
-        last_msg = obj.messages.order_by('-created_at').first()
+        last_msg = obj._latest[0] if obj._latest else None
         if last_msg:
             preview = last_msg.content[:50] + '...' if len(last_msg.content) > 50 else last_msg.content
             return f"[{last_msg.role}] {preview}"
@@ -135,6 +204,10 @@ class ChatMessageAdmin(admin.ModelAdmin):
     search_fields = ('session__id', 'content')
     ordering = ('-created_at',)
     readonly_fields = ('id', 'created_at')
+    list_select_related = ('session',)
+    list_per_page = 25
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Basic Info', {
@@ -149,7 +222,7 @@ class ChatMessageAdmin(admin.ModelAdmin):
     )
     
     def session_id(self, obj):
-        return str(obj.session.id)[:8] + '...'
+        return str(obj.session_id)[:8] + '...'
     session_id.short_description = 'Session'
     
     def content_preview(self, obj):
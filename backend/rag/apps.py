@@ -1,7 +1,70 @@
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+logger = logging.getLogger(__name__)
+
+
+_pgvector_registered = False
+
+
+def _register_pgvector(sender, connection, **kwargs):
+    """
+    Register pgvector's psycopg2 adapters so numpy arrays can be passed
+    directly as query parameters (and vector columns come back as arrays).
+    
+    Registration is global, so it only needs to succeed once. Databases
+    without the vector type (the maintenance database used to create the
+    test DB, a fresh database before migrations) are skipped, and the next
+    connection tries again.
+    """
+    global _pgvector_registered
+    if _pgvector_registered or connection.vendor != 'postgresql':
+        return
+    
+    import psycopg2
+    from pgvector.psycopg2 import register_vector
+    try:
+        register_vector(connection.connection, globally=True)
+    except psycopg2.ProgrammingError:
+        logger.debug("[RagConfig] vector type not found, deferring pgvector registration")
+        return
+    _pgvector_registered = True
+
+
+def _warm_up():
+    """
+    Load the embedding model, tiktoken encoding and Tesseract binary at
+    startup so the first request doesn't pay for it.
+    
+    Failures are logged rather than raised; the lazy loaders will retry
+    on first use.
+    """
+    from rag.services.embeddings import _get_model
+    from rag.services.chunker import TextChunker
+    import pytesseract
+    
+    for name, load in (
+        ('embedding model', _get_model),
+        ('tiktoken encoding', TextChunker._get_encoder),
+        ('tesseract', pytesseract.get_tesseract_version),
+    ):
+        try:
+            load()
+        except Exception:
+            logger.warning("[RagConfig] Failed to warm up %s", name, exc_info=True)
 
 
 class RagConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rag'
     verbose_name = 'RAG Chatbot'
+    
+    def ready(self):
+        connection_created.connect(_register_pgvector, dispatch_uid='rag_register_pgvector')
+        
+        if settings.RAG_WARMUP_MODELS:
+            _warm_up()
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-15 09:12
+
+import pgvector.django.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rag', '0004_chatsession_chatmessage_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='documentchunk',
+            index=pgvector.django.indexes.HnswIndex(ef_construction=64, fields=['embedding'], m=16, name='document_chunks_embedding_hnsw', opclasses=['vector_cosine_ops']),
+        ),
+    ]
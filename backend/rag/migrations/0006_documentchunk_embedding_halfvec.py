@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-15 10:03
+
+import pgvector.django.halfvec
+import pgvector.django.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rag', '0005_documentchunk_embedding_hnsw'),
+    ]
+
+    operations = [
+        # The vector_cosine_ops index cannot be kept across the type change
+        migrations.RemoveIndex(
+            model_name='documentchunk',
+            name='document_chunks_embedding_hnsw',
+        ),
+        migrations.AlterField(
+            model_name='documentchunk',
+            name='embedding',
+            field=pgvector.django.halfvec.HalfVectorField(dimensions=384),
+        ),
+        migrations.AddIndex(
+            model_name='documentchunk',
+            index=pgvector.django.indexes.HnswIndex(ef_construction=64, fields=['embedding'], m=16, name='document_chunks_embedding_hnsw', opclasses=['halfvec_cosine_ops']),
+        ),
+    ]
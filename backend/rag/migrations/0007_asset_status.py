@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-15 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rag', '0006_documentchunk_embedding_halfvec'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='asset',
+            name='cloudinary_public_id',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='asset',
+            name='cloudinary_url',
+            field=models.URLField(blank=True, max_length=500),
+        ),
+    ]
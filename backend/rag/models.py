@@ -8,7 +8,7 @@ DocumentChunk: Stores text chunks with embeddings for semantic search
 import uuid
 from django.db import models
 from django.conf import settings
-from pgvector.django import VectorField
+from pgvector.django import HalfVectorField, HnswIndex
 
 
 class Asset(models.Model):
@@ -26,6 +26,17 @@ class Asset(models.Model):
         ('image', 'Image (PNG/JPG/JPEG)'),
     )
     
+    # Processing state (background uploads start as processing, with no
+    # Cloudinary file yet)
+    STATUS_PROCESSING = 'processing'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUSES = (
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_READY, 'Ready'),
+        (STATUS_FAILED, 'Failed'),
+    )
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -33,9 +44,10 @@ class Asset(models.Model):
         related_name='assets'
     )
     asset_type = models.CharField(max_length=20, choices=ASSET_TYPES)
-    cloudinary_url = models.URLField(max_length=500)
-    cloudinary_public_id = models.CharField(max_length=255)
+    cloudinary_url = models.URLField(max_length=500, blank=True)
+    cloudinary_public_id = models.CharField(max_length=255, blank=True)
     original_filename = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUSES, default=STATUS_READY)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -74,8 +86,9 @@ class DocumentChunk(models.Model):
     source = models.CharField(max_length=50, default='user_upload')
     content = models.TextField()
     
-    # sentence-transformers all-MiniLM-L6-v2 produces 384-dimensional vectors
-    embedding = VectorField(dimensions=384)
+    # sentence-transformers all-MiniLM-L6-v2 produces 384-dimensional vectors,
+    # stored as fp16 (halfvec) to halve row size and HNSW scan bandwidth
+    embedding = HalfVectorField(dimensions=384)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -83,6 +96,14 @@ class DocumentChunk(models.Model):
         indexes = [
             models.Index(fields=['user_id', 'created_at']),
             models.Index(fields=['asset', 'created_at']),
+            # ANN index for cosine-distance ORDER BY in the retriever
+            HnswIndex(
+                name='document_chunks_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['halfvec_cosine_ops'],
+            ),
         ]
         ordering = ['-created_at']
 
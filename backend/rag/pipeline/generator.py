@@ -5,18 +5,16 @@ Generates answers using LLM with optional context from retrieved documents.
 Handles the logic of when to use context vs general knowledge.
 """
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 from rag.services.llm import LLMService
 from rag.prompts.rag import get_rag_system_prompt, format_rag_user_message
-from rag.pipeline.retriever import RetrievedChunk, Retriever
+from rag.pipeline.retriever import RetrievedChunk, Retriever, SourceSnippet
 
 
-@dataclass
-class SourceSnippet:
-    """Source information for a retrieved chunk."""
-    asset_id: str
-    excerpt: str
+# Stable key so the provider routes requests sharing the RAG system prompt
+# to the same prefix (KV) cache
+RAG_PROMPT_CACHE_KEY = 'rag-system'
 
 
 @dataclass
@@ -35,53 +33,64 @@ class Generator:
     and query type.
     """
     
-    @classmethod
-    async def generate(
-        cls,
+    @staticmethod
+    def _prepare(
         question: str,
-        chunks: list[RetrievedChunk] | None = None
-    ) -> GeneratedAnswer:
+        chunks: list[RetrievedChunk] | None
+    ) -> tuple[str, str, list[SourceSnippet] | None, bool]:
         """
-        Generate an answer to the user's question.
+        Build everything shared by generate and stream_generate.
         
         Args:
             question: The user's question
             chunks: Retrieved document chunks, or None for general-only answers
             
         Returns:
-            GeneratedAnswer with the response and context usage flag
+            Tuple of (system_prompt, user_message, sources, use_context)
         """
         # Determine if we should use context
-        use_context = chunks is not None and Retriever.has_relevant_context(chunks)
+        use_context = bool(chunks) and len(chunks) >= Retriever.MIN_CHUNKS_FOR_CONTEXT
         
-        # Format context if available
+        # Format context and top source snippets in one pass
         context = None
+        sources = None
         if use_context:
-            context = Retriever.format_context(chunks)
+            context, sources = Retriever.format_context_and_sources(chunks)
         
-        # Build the prompt
+        # Build the prompt (system prompt is a module constant, so it stays
+        # byte-identical across requests)
         system_prompt = get_rag_system_prompt()
         user_message = format_rag_user_message(question, context)
         
+        return system_prompt, user_message, sources, use_context
+    
+    @classmethod
+    async def generate(
+        cls,
+        question: str,
+        chunks: list[RetrievedChunk] | None = None
+    ) -> GeneratedAnswer:
+        """
+        Generate an answer to the user's question.
+        
+        Args:
+            question: The user's question
+            chunks: Retrieved document chunks, or None for general-only answers
+            
+        Returns:
+            GeneratedAnswer with the response and context usage flag
+        """
+        system_prompt, user_message, sources, use_context = cls._prepare(question, chunks)
+        
         # Generate the answer
         answer = await LLMService.complete(
             system_prompt=system_prompt,
             user_message=user_message,
             temperature=0.7,  # Some creativity for helpful responses
-            max_tokens=1024
+            max_tokens=1024,
+            prompt_cache_key=RAG_PROMPT_CACHE_KEY
         )
         
-        # Extract source snippets if context was used
-        sources = None
-        if use_context and chunks:
-            sources = [
-                SourceSnippet(
-                    asset_id=str(chunk.asset_id) if chunk.asset_id else "unknown",
-                    excerpt=chunk.content[:100]  # First 100 chars as excerpt
-                )
-                for chunk in chunks[:3]  # Top 3 sources
-            ]
-        
         return GeneratedAnswer(
             answer=answer.strip(),
             used_context=use_context,
@@ -104,34 +113,21 @@ class Generator:
         Yields:
             Tokens as they are generated, then final metadata
         """
-        # Determine if we should use context
-        use_context = chunks is not None and Retriever.has_relevant_context(chunks)
-        
-        # Format context if available
-        context = None
-        if use_context:
-            context = Retriever.format_context(chunks)
-        
-        # Build the prompt
-        system_prompt = get_rag_system_prompt()
-        user_message = format_rag_user_message(question, context)
+        system_prompt, user_message, sources, use_context = cls._prepare(question, chunks)
         
         # Stream the answer
         async for token in LLMService.stream_complete(
             system_prompt=system_prompt,
             user_message=user_message,
             temperature=0.7,
-            max_tokens=1024
+            max_tokens=1024,
+            prompt_cache_key=RAG_PROMPT_CACHE_KEY
         ):
             yield {"type": "token", "content": token}
         
-        # Extract source snippets
-        sources = None
-        if use_context and chunks:
-            sources = [
-                {"asset_id": str(chunk.asset_id) if chunk.asset_id else "unknown", "excerpt": chunk.content[:100]}
-                for chunk in chunks[:3]
-            ]
-        
         # Yield final metadata
-        yield {"type": "done", "used_context": use_context, "sources": sources}
+        yield {
+            "type": "done",
+            "used_context": use_context,
+            "sources": [asdict(source) for source in sources] if sources else None
+        }
@@ -5,9 +5,13 @@ Classifies user queries to determine if document retrieval is needed.
 Uses a single LLM call with JSON output for efficiency.
 """
 
+import hashlib
 from enum import Enum
 from typing import Literal
 
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
 from rag.services.llm import LLMService
 from rag.prompts.classifier import get_classifier_prompt
 
@@ -22,6 +26,10 @@ class QueryType(str, Enum):
 # Type alias for the query type literals
 QueryTypeLiteral = Literal["GENERAL", "PROFILE_DEPENDENT", "HYBRID"]
 
+# Classifications are deterministic (temperature=0.0), so cache them by query
+CLASSIFICATION_CACHE_PREFIX = 'qcls:'
+CLASSIFICATION_CACHE_TIMEOUT = 86400  # 24 hours
+
 
 class QueryClassifier:
     """
@@ -42,6 +50,11 @@ class QueryClassifier:
         Returns:
             QueryType enum value indicating classification
         """
+        cache_key = cls._cache_key(query)
+        cached = await sync_to_async(cache.get)(cache_key)
+        if cached is not None:
+            return cls._to_query_type(cached)
+        
         system_prompt = get_classifier_prompt()
         
         # Use JSON mode for structured output
@@ -54,8 +67,22 @@ class QueryClassifier:
         
         # Extract query type from response
         raw_type = response.get("query_type", "GENERAL")
+        query_type = cls._to_query_type(raw_type)
         
-        # Validate and map to enum (default to GENERAL if invalid)
+        await sync_to_async(cache.set)(
+            cache_key, query_type.value, timeout=CLASSIFICATION_CACHE_TIMEOUT
+        )
+        return query_type
+    
+    @staticmethod
+    def _cache_key(query: str) -> str:
+        """Build a content-addressed cache key for a normalized query."""
+        digest = hashlib.blake2b(query.strip().lower().encode(), digest_size=16).hexdigest()
+        return CLASSIFICATION_CACHE_PREFIX + digest
+    
+    @staticmethod
+    def _to_query_type(raw_type: str) -> QueryType:
+        """Validate and map a raw LLM value to QueryType (default GENERAL)."""
         try:
             return QueryType(raw_type)
         except ValueError:
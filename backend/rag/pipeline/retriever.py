@@ -7,7 +7,10 @@ Returns relevant document chunks above the similarity threshold.
 
 from dataclasses import dataclass
 from typing import List
-from django.db import connection
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
 from asgiref.sync import sync_to_async
 
 from rag.models import DocumentChunk
@@ -19,6 +22,12 @@ DEFAULT_TOP_K = 8
 # Minimum similarity score to consider a chunk relevant
 # Cosine similarity ranges from -1 to 1; 0.25 is a reasonable threshold
 SIMILARITY_THRESHOLD = 0.25
+# HNSW candidate list size at query time (higher = better recall, slower)
+HNSW_EF_SEARCH = 40
+# First pgvector release with hnsw.iterative_scan
+ITERATIVE_SCAN_MIN_VERSION = (0, 8, 0)
+# Above this many rows, filter/sort similarities with NumPy instead of a Python loop
+VECTORIZE_ROWS_ABOVE = 32
 
 
 @dataclass
@@ -29,38 +38,176 @@ class RetrievedChunk:
     doc_type: str
     similarity: float
     asset_id: str | None = None
+    asset_filename: str | None = None
+    asset_url: str | None = None
+
+
+@dataclass
+class SourceSnippet:
+    """Source information for a retrieved chunk."""
+    asset_id: str
+    excerpt: str
+    asset_filename: str | None = None
+    asset_url: str | None = None
+
+
+# Number of top chunks surfaced as sources
+MAX_SOURCES = 3
+# Characters of chunk content used as a source excerpt
+EXCERPT_LENGTH = 100
+
+
+# Context headers keyed by (position, doc_type); both come from small sets
+_DOC_HEADER_CACHE: dict[tuple[int, str], str] = {}
+
 
+def _header(i: int, doc_type: str) -> str:
+    """Return the cached "[Document i - TYPE]" header for a context block."""
+    key = (i, doc_type)
+    header = _DOC_HEADER_CACHE.get(key)
+    if header is None:
+        header = f"[Document {i} - {doc_type.upper()}]"
+        _DOC_HEADER_CACHE[key] = header
+    return header
 
-def _execute_vector_search(embedding_str: str, user_id: str, top_k: int) -> List[tuple]:
+
+# Single-query search; placeholders are filled per execution mode below
+_VECTOR_SEARCH_SQL = """
+    SELECT 
+        c.id,
+        c.content,
+        c.document_id,
+        c.doc_type,
+        c.asset_id,
+        1 - (c.embedding <=> q.e) as similarity,
+        a.original_filename,
+        a.cloudinary_url
+    FROM document_chunks c
+    CROSS JOIN (SELECT {embedding}::halfvec AS e) AS q
+    LEFT JOIN assets a ON a.id = c.asset_id
+    WHERE c.user_id = {user_id}
+    ORDER BY {order_by}
+    LIMIT {limit}
+"""
+# Raw distance ordering is what the HNSW index can serve
+_INDEX_ORDER = 'c.embedding <=> q.e'
+# Same ranking as an expression the index can't serve: an exact scan of
+# the user's rows (via the user_id index) plus a sort
+_EXACT_ORDER = 'similarity DESC'
+
+_VECTOR_SEARCH_QUERY = _VECTOR_SEARCH_SQL.format(
+    embedding='%s', user_id='%s', limit='%s', order_by=_INDEX_ORDER
+)
+_EXACT_SEARCH_QUERY = _VECTOR_SEARCH_SQL.format(
+    embedding='%s', user_id='%s', limit='%s', order_by=_EXACT_ORDER
+)
+
+PREPARED_SEARCH_NAME = 'rag_chunk_search'
+_PREPARE_SEARCH_QUERY = (
+    f"PREPARE {PREPARED_SEARCH_NAME}(halfvec, varchar, integer) AS "
+    + _VECTOR_SEARCH_SQL.format(embedding='$1', user_id='$2', limit='$3', order_by=_INDEX_ORDER)
+)
+
+
+def _ensure_search_prepared(cursor) -> None:
+    """
+    PREPARE the search statement once per physical DB connection.
+    
+    Tracks the raw connection the statement was prepared on, so a
+    reconnect (CONN_MAX_AGE expiry, health-check failure) re-prepares.
+    """
+    raw_connection = connection.connection
+    if getattr(connection, '_rag_search_prepared_on', None) is raw_connection:
+        return
+    cursor.execute(_PREPARE_SEARCH_QUERY)
+    connection._rag_search_prepared_on = raw_connection
+
+
+_SET_SEARCH_PARAMS = f"SET LOCAL hnsw.ef_search = {HNSW_EF_SEARCH}"
+_SET_ITERATIVE_SEARCH_PARAMS = _SET_SEARCH_PARAMS + "; SET LOCAL hnsw.iterative_scan = strict_order"
+
+# Whether the server's pgvector supports iterative index scans; looked up once
+_iterative_scan_supported: bool | None = None
+
+
+def _supports_iterative_scan(cursor) -> bool:
+    """Check (once per process) whether the vector extension is 0.8.0 or newer."""
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        row = cursor.fetchone()
+        version = tuple(int(part) for part in row[0].split('.')) if row else ()
+        _iterative_scan_supported = version >= ITERATIVE_SCAN_MIN_VERSION
+    return _iterative_scan_supported
+
+
+def _execute_vector_search(embedding: np.ndarray, user_id: str, top_k: int) -> List[tuple]:
     """
     Execute the vector similarity search query synchronously.
     This is wrapped with sync_to_async when called from async context.
+    
+    The embedding is bound once and ordered by raw cosine distance so the
+    HNSW index can serve the ORDER BY ... LIMIT; the similarity threshold
+    is applied by the caller. With RAG_PREPARED_SEARCH enabled the plan is
+    prepared once per connection and reused via EXECUTE.
+    
+    The HNSW index is shared by all users and the user_id filter applies to
+    the ef_search candidates it yields, so a user owning a small share of
+    the table can come back short. On pgvector 0.8+ an iterative scan keeps
+    walking the index until top_k of the user's rows are found. Older
+    servers fall back to an exact scan when fewer than top_k rows come back.
+    """
+    # SET LOCAL only lasts for the surrounding transaction
+    with transaction.atomic(), connection.cursor() as cursor:
+        iterative = _supports_iterative_scan(cursor)
+        cursor.execute(_SET_ITERATIVE_SEARCH_PARAMS if iterative else _SET_SEARCH_PARAMS)
+        if settings.RAG_PREPARED_SEARCH:
+            _ensure_search_prepared(cursor)
+            cursor.execute(
+                f"EXECUTE {PREPARED_SEARCH_NAME}(%s, %s, %s)",
+                [embedding, user_id, top_k]
+            )
+        else:
+            cursor.execute(_VECTOR_SEARCH_QUERY, [embedding, user_id, top_k])
+        rows = cursor.fetchall()
+        
+        if len(rows) < top_k and not iterative:
+            cursor.execute(_EXACT_SEARCH_QUERY, [embedding, user_id, top_k])
+            rows = cursor.fetchall()
+        return rows
+
+
+def _row_to_chunk(row: tuple) -> RetrievedChunk:
+    """
+    Build a RetrievedChunk from an (id, content, document_id, doc_type,
+    asset_id, similarity, asset_filename, asset_url) row.
     """
-    sql = """
-        SELECT 
-            id,
-            content,
-            document_id,
-            doc_type,
-            asset_id,
-            1 - (embedding <=> %s::vector) as similarity
-        FROM document_chunks
-        WHERE user_id = %s
-        AND (1 - (embedding <=> %s::vector)) >= %s
-        ORDER BY embedding <=> %s::vector
-        LIMIT %s
+    return RetrievedChunk(
+        content=row[1],
+        document_id=str(row[2]),
+        doc_type=row[3],
+        asset_id=str(row[4]) if row[4] else None,
+        similarity=float(row[5]),
+        asset_filename=row[6],
+        asset_url=row[7]
+    )
+
+
+def _rows_to_chunks(rows: List[tuple], top_k: int) -> List[RetrievedChunk]:
     """
+    Apply the similarity threshold and top_k to search rows.
     
-    with connection.cursor() as cursor:
-        cursor.execute(sql, [
-            embedding_str, 
-            user_id, 
-            embedding_str, 
-            SIMILARITY_THRESHOLD,
-            embedding_str, 
-            top_k
-        ])
-        return cursor.fetchall()
+    Small result sets use a plain loop; large ones (debug/monitoring
+    queries) compute the mask and ordering in NumPy and only materialize
+    the selected rows.
+    """
+    if top_k <= VECTORIZE_ROWS_ABOVE or len(rows) <= VECTORIZE_ROWS_ABOVE:
+        return [_row_to_chunk(row) for row in rows if row[5] >= SIMILARITY_THRESHOLD][:top_k]
+    
+    sims = np.fromiter((row[5] for row in rows), dtype=np.float32, count=len(rows))
+    selected = np.flatnonzero(sims >= SIMILARITY_THRESHOLD)
+    order = selected[np.argsort(-sims[selected], kind='stable')][:top_k]
+    return [_row_to_chunk(rows[i]) for i in order]
 
 
 class Retriever:
@@ -71,6 +218,10 @@ class Retriever:
     Uses cosine similarity with a threshold check.
     """
     
+    # Retrieved chunks already pass SIMILARITY_THRESHOLD; this is how many
+    # are needed before the answer is grounded in the user's documents
+    MIN_CHUNKS_FOR_CONTEXT = 1
+    
     @classmethod
     async def retrieve(
         cls,
@@ -92,57 +243,65 @@ class Retriever:
         # Generate query embedding
         query_embedding = await EmbeddingsService.generate_embedding(query)
         
-        # Convert embedding list to pgvector format
-        embedding_str = f"[{','.join(map(str, query_embedding))}]"
-        
-        # Execute query with sync_to_async wrapper
-        rows = await sync_to_async(_execute_vector_search)(
-            embedding_str, user_id, top_k
-        )
-        
-        chunks = []
-        for row in rows:
-            chunks.append(RetrievedChunk(
-                content=row[1],
-                document_id=str(row[2]),
-                doc_type=row[3],
-                asset_id=str(row[4]) if row[4] else None,
-                similarity=float(row[5])  # Now position 5 after adding asset_id
-            ))
-        
-        return chunks
+        return await cls.retrieve_with_embedding(query_embedding, user_id, top_k)
     
     @classmethod
-    def format_context(cls, chunks: List[RetrievedChunk]) -> str | None:
+    async def retrieve_with_embedding(
+        cls,
+        query_embedding: np.ndarray,
+        user_id: str,
+        top_k: int = DEFAULT_TOP_K
+    ) -> List[RetrievedChunk]:
         """
-        Format retrieved chunks into a context string.
+        Retrieve relevant chunks for an already-computed query embedding.
+        
+        Lets callers compute the embedding concurrently with other work
+        (e.g. query classification).
         
         Args:
-            chunks: List of retrieved chunks
+            query_embedding: Embedding of the user's question
+            user_id: User ID for strict filtering
+            top_k: Maximum number of chunks to retrieve
             
         Returns:
-            Formatted context string, or None if no chunks
+            List of RetrievedChunk objects sorted by similarity (highest first)
         """
-        if not chunks:
-            return None
-        
-        context_parts = []
-        for i, chunk in enumerate(chunks, 1):
-            context_parts.append(
-                f"[Document {i} - {chunk.doc_type.upper()}]\n{chunk.content}"
-            )
+        # Execute query with sync_to_async wrapper (the ndarray is adapted by pgvector)
+        rows = await sync_to_async(_execute_vector_search)(
+            query_embedding, user_id, top_k
+        )
         
-        return "\n\n---\n\n".join(context_parts)
+        return _rows_to_chunks(rows, top_k)
     
     @classmethod
-    def has_relevant_context(cls, chunks: List[RetrievedChunk]) -> bool:
+    def format_context_and_sources(
+        cls,
+        chunks: List[RetrievedChunk]
+    ) -> tuple[str | None, List[SourceSnippet]]:
         """
-        Check if any retrieved chunks are above the similarity threshold.
+        Format retrieved chunks into a context string and source snippets.
+        
+        Builds both outputs in a single pass over the chunks.
         
         Args:
             chunks: List of retrieved chunks
             
         Returns:
-            True if there are relevant chunks
+            Tuple of (formatted context string or None, top source snippets)
         """
-        return len(chunks) > 0
+        if not chunks:
+            return None, []
+        
+        context_parts = []
+        sources = []
+        for i, chunk in enumerate(chunks, 1):
+            context_parts.append(f"{_header(i, chunk.doc_type)}\n{chunk.content}")
+            if i <= MAX_SOURCES:
+                sources.append(SourceSnippet(
+                    asset_id=str(chunk.asset_id) if chunk.asset_id else "unknown",
+                    excerpt=chunk.content[:EXCERPT_LENGTH],
+                    asset_filename=chunk.asset_filename,
+                    asset_url=chunk.asset_url
+                ))
+        
+        return "\n\n---\n\n".join(context_parts), sources
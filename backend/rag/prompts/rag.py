@@ -43,13 +43,6 @@ DO NOT:
 - Store or reference previous conversation history"""
 
 
-RAG_USER_TEMPLATE = """CONTEXT:
-{context}
-
-USER QUESTION:
-{question}"""
-
-
 NO_CONTEXT_MARKER = "No relevant context found. Answer from general knowledge."
 
 
@@ -69,5 +62,4 @@ def format_rag_user_message(question: str, context: str | None) -> str:
     Returns:
         Formatted user message string
     """
-    context_text = context if context else NO_CONTEXT_MARKER
-    return RAG_USER_TEMPLATE.format(context=context_text, question=question)
+    return f"CONTEXT:\n{context or NO_CONTEXT_MARKER}\n\nUSER QUESTION:\n{question}"
@@ -2,10 +2,31 @@
 API Serializers for RAG system including Asset management.
 """
 
+import copy
+
 from rest_framework import serializers
 from rag.models import Asset, ChatSession, ChatMessage
 
 
+class FastModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that introspects its model once per class.
+    
+    The field map built by ModelSerializer.get_fields() is cached on the
+    subclass and deep-copied per instance (the same way DRF copies
+    declared fields), skipping model metadata introspection on every
+    instantiation. Only for serializers whose fields don't depend on context.
+    """
+    
+    def get_fields(self):
+        cls = type(self)
+        cached = cls.__dict__.get('_cached_fields')
+        if cached is None:
+            cached = super().get_fields()
+            cls._cached_fields = cached
+        return copy.deepcopy(cached)
+
+
 class DocumentUploadSerializer(serializers.Serializer):
     """Serializer for document upload request."""
     file = serializers.FileField(help_text="PDF or DOCX file to upload")
@@ -31,6 +52,12 @@ class SourceSnippetSerializer(serializers.Serializer):
     """Source snippet from retrieved context."""
     asset_id = serializers.UUIDField(help_text="Asset this snippet came from")
     excerpt = serializers.CharField(help_text="Text excerpt (first 100 chars)")
+    asset_filename = serializers.CharField(
+        required=False, allow_null=True, help_text="Original filename of the asset"
+    )
+    asset_url = serializers.URLField(
+        required=False, allow_null=True, help_text="Cloudinary URL of the asset"
+    )
 
 
 class ChatResponseSerializer(serializers.Serializer):
@@ -43,7 +70,7 @@ class ChatResponseSerializer(serializers.Serializer):
     sources = SourceSnippetSerializer(many=True, required=False, help_text="Source snippets")
 
 
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(FastModelSerializer):
     """Serializer for Asset model."""
     class Meta:
         model = Asset
@@ -52,24 +79,19 @@ class AssetSerializer(serializers.ModelSerializer):
             'asset_type',
             'cloudinary_url',
             'original_filename',
+            'status',
             'created_at'
         ]
         read_only_fields = fields
 
 
-class AssetListResponseSerializer(serializers.Serializer):
-    """Response for asset list endpoint."""
-    assets = AssetSerializer(many=True)
-    total = serializers.IntegerField()
-
-
 class ErrorSerializer(serializers.Serializer):
     """Standard error response."""
     error = serializers.CharField(help_text="Error message")
     detail = serializers.CharField(required=False, help_text="Additional details")
 
 
-class ChatMessageSerializer(serializers.ModelSerializer):
+class ChatMessageSerializer(FastModelSerializer):
     """Serializer for ChatMessage model."""
     class Meta:
         model = ChatMessage
@@ -77,25 +99,28 @@ class ChatMessageSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class ChatSessionSerializer(serializers.ModelSerializer):
-    """Serializer for ChatSession with message count."""
-    message_count = serializers.SerializerMethodField()
+class ChatSessionListSerializer(FastModelSerializer):
+    """
+    Lightweight serializer for the session list.
+    
+    Never touches the messages relation: expects the queryset to be
+    annotated with message_count, last_message_at and _last_message_content
+    (see ChatSessionListView).
+    """
+    message_count = serializers.IntegerField(read_only=True)
+    last_message_at = serializers.DateTimeField(read_only=True, allow_null=True)
     last_message = serializers.SerializerMethodField()
     
     class Meta:
         model = ChatSession
-        fields = ['id', 'created_at', 'updated_at', 'message_count', 'last_message']
+        fields = ['id', 'created_at', 'updated_at', 'message_count', 'last_message_at', 'last_message']
         read_only_fields = fields
     
-    def get_message_count(self, obj):
-        return obj.messages.count()
-    
     def get_last_message(self, obj):
-        last_msg = obj.messages.order_by('-created_at').first()
-        return last_msg.content[:100] if last_msg else None
+        return obj._last_message_content[:100] if obj._last_message_content else None
 
 
-class ChatSessionDetailSerializer(serializers.ModelSerializer):
+class ChatSessionDetailSerializer(FastModelSerializer):
     """Serializer for ChatSession with all messages."""
     messages = ChatMessageSerializer(many=True, read_only=True)
     
@@ -5,8 +5,11 @@ Splits text into overlapping chunks for embedding and retrieval.
 Uses tiktoken for accurate token counting with OpenAI models.
 """
 
-from typing import List
+from typing import Iterable, List
+
+import numpy as np
 import tiktoken
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 # Configuration: matches OpenAI embedding model tokenization
@@ -15,6 +18,8 @@ ENCODING_NAME = 'cl100k_base'
 DEFAULT_CHUNK_SIZE = 500
 # Overlap between consecutive chunks for context continuity
 DEFAULT_CHUNK_OVERLAP = 100
+# Inserted between pages when chunking page streams
+PAGE_SEPARATOR = '\n\n'
 
 
 class TextChunker:
@@ -56,39 +61,105 @@ class TextChunker:
         if not text.strip():
             return []
         
-        encoder = cls._get_encoder()
-        
-        # Encode the entire text to tokens
-        tokens = encoder.encode(text)
+        # Encode the entire text to tokens (once)
+        tokens = cls.encode(text)
         
         if len(tokens) <= chunk_size:
             # Text fits in a single chunk
             return [text]
         
-        chunks = []
-        start = 0
+        return cls.chunk_tokens(tokens, chunk_size, chunk_overlap)
+    
+    @classmethod
+    def chunk_pages(
+        cls,
+        pages: Iterable[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
+    ) -> List[str]:
+        """
+        Chunk a document given as a sequence of page texts.
         
-        while start < len(tokens):
-            # Get chunk_size tokens starting from start
-            end = min(start + chunk_size, len(tokens))
-            chunk_tokens = tokens[start:end]
-            
-            # Decode tokens back to text
-            chunk_text = encoder.decode(chunk_tokens)
-            chunks.append(chunk_text)
+        Pages are tokenized with one encode_batch call and joined at the
+        token level (with a paragraph break between pages), so the full
+        document is never materialized as a single string. Chunks may
+        span page boundaries, as with chunk_text.
+        
+        Args:
+            pages: Page texts in document order
+            chunk_size: Maximum tokens per chunk (default: 500)
+            chunk_overlap: Tokens to overlap between chunks (default: 100)
             
-            # Move start forward by (chunk_size - overlap)
-            # This creates the overlap with the next chunk
-            start += chunk_size - chunk_overlap
+        Returns:
+            List of text chunks
+        """
+        pages = [page for page in pages if page.strip()]
+        if not pages:
+            return []
+        
+        encoder = cls._get_encoder()
+        separator = encoder.encode(PAGE_SEPARATOR)
+        
+        tokens: List[int] = []
+        for i, page_tokens in enumerate(encoder.encode_batch(pages)):
+            if i:
+                tokens.extend(separator)
+            tokens.extend(page_tokens)
+        
+        if len(tokens) <= chunk_size:
+            # Document fits in a single chunk
+            return [PAGE_SEPARATOR.join(pages)]
+        
+        return cls.chunk_tokens(tokens, chunk_size, chunk_overlap)
+    
+    @classmethod
+    def encode(cls, text: str) -> List[int]:
+        """Encode text to tokens; reuse the result for counting and chunking."""
+        return cls._get_encoder().encode(text)
+    
+    @classmethod
+    def chunk_tokens(
+        cls,
+        tokens: List[int],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
+    ) -> List[str]:
+        """
+        Split an already-encoded token list into overlapping text chunks.
+        
+        All chunk slices are decoded with a single decode_batch call.
+        
+        Args:
+            tokens: Token IDs from encode()
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Tokens to overlap between chunks
             
-            # Safety check: ensure we make progress
-            if start <= 0:
-                start = chunk_size
+        Returns:
+            List of text chunks
+        """
+        # Move forward by (chunk_size - overlap) to create the overlap;
+        # ensure we always make progress
+        stride = chunk_size - chunk_overlap
+        if stride <= 0:
+            stride = chunk_size
+        
+        arr = np.asarray(tokens, dtype=np.int32)
+        n = len(arr)
+        
+        # Full-length windows as a zero-copy strided view
+        slices = []
+        tail_start = 0
+        if n >= chunk_size:
+            windows = sliding_window_view(arr, chunk_size)[::stride]
+            slices = windows.tolist()
+            tail_start = len(windows) * stride
         
-        return chunks
+        # Shorter trailing windows (not padded: padding would decode as real tokens)
+        slices.extend(arr[start:].tolist() for start in range(tail_start, n, stride))
+        
+        return cls._get_encoder().decode_batch(slices)
     
     @classmethod
     def count_tokens(cls, text: str) -> int:
         """Count the number of tokens in text."""
-        encoder = cls._get_encoder()
-        return len(encoder.encode(text))
+        return len(cls.encode(text))
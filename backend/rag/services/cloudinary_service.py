@@ -3,12 +3,20 @@ Cloudinary Service for file storage.
 
 Handles uploading and deleting files from Cloudinary.
 Never stores raw files locally.
+
+Requests are signed locally with the SDK and sent over the shared async
+HTTP client (rag.services.http), so uploads never block the event loop
+or a worker thread.
 """
 
+import asyncio
+import time
 import cloudinary
-import cloudinary.uploader
+import cloudinary.utils
 from django.conf import settings
-from typing import Tuple
+from typing import Any, BinaryIO, Tuple, Union
+from rag.services.file_types import resource_type_for
+from rag.services.http import get_client
 
 
 # Configure Cloudinary on module load
@@ -20,6 +28,16 @@ cloudinary.config(
 )
 
 
+# Files larger than this are sent with the chunked upload protocol
+# (same part size as the SDK's upload_large, which needs >= 5MB parts)
+UPLOAD_CHUNK_SIZE = 6 * 1024 * 1024
+
+
+class CloudinaryServiceError(Exception):
+    """Raised when a Cloudinary API call fails."""
+    pass
+
+
 class CloudinaryService:
     """
     Service for uploading and managing files on Cloudinary.
@@ -32,9 +50,61 @@ class CloudinaryService:
     """
     
     @classmethod
-    def upload(
+    async def _call_api(
         cls,
-        file_bytes: bytes,
+        action: str,
+        params: dict[str, Any],
+        resource_type: str,
+        file: Any = None,
+        headers: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Sign and POST an Upload API request.
+        
+        Args:
+            action: Upload API action ("upload", "destroy")
+            params: Request parameters (timestamp is added here)
+            resource_type: "image" or "raw"
+            file: Optional (filename, content) multipart file tuple
+            headers: Optional extra HTTP headers
+            
+        Returns:
+            Parsed JSON response
+            
+        Raises:
+            CloudinaryServiceError: If Cloudinary rejects the request
+        """
+        params = cloudinary.utils.sign_request(
+            {**params, 'timestamp': int(time.time())}, {}
+        )
+        url = cloudinary.utils.cloudinary_api_url(action, resource_type=resource_type)
+        
+        response = await get_client().post(
+            url,
+            data={key: str(value) for key, value in params.items()},
+            files={'file': file} if file is not None else None,
+            headers=headers
+        )
+        # Error bodies from Cloudinary's edge or a proxy (502, 413) may be
+        # HTML or empty, so only trust the JSON error message if there is one
+        try:
+            result = response.json()
+        except ValueError:
+            result = None
+        error = result.get('error') if isinstance(result, dict) else None
+        
+        if response.is_error or error or not isinstance(result, dict):
+            message = error.get('message') if isinstance(error, dict) else None
+            raise CloudinaryServiceError(
+                f"Cloudinary {action} failed: {message or response.reason_phrase}"
+            )
+        
+        return result
+    
+    @classmethod
+    async def upload(
+        cls,
+        file_bytes: Union[bytes, BinaryIO],
         filename: str,
         folder: str = "rag_uploads",
         resource_type: str = "auto"
@@ -43,36 +113,80 @@ class CloudinaryService:
         Upload a file to Cloudinary.
         
         Args:
-            file_bytes: Raw file content
+            file_bytes: Raw file content, or a binary file (read from the start)
             filename: Original filename for metadata
             folder: Cloudinary folder to organize files
             resource_type: "auto", "image", or "raw" (for PDFs/docs)
             
         Returns:
             Tuple of (url, public_id) for storage and deletion
+            
+        Raises:
+            CloudinaryServiceError: If the upload fails
         """
         # Determine resource type based on file extension
-        ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        # (PDFs and documents need resource_type="raw")
+        resource_type = resource_type_for(filename, resource_type)
         
-        # PDFs and documents need resource_type="raw"
-        if ext in ('pdf', 'docx', 'doc', 'txt'):
-            resource_type = 'raw'
-        elif ext in ('png', 'jpg', 'jpeg', 'gif', 'webp'):
-            resource_type = 'image'
+        params = {
+            'folder': folder,
+            'public_id': filename.rsplit('.', 1)[0] if '.' in filename else filename,
+            'use_filename': True,
+            'unique_filename': True,
+        }
         
-        result = cloudinary.uploader.upload(
-            file_bytes,
-            folder=folder,
-            resource_type=resource_type,
-            public_id=filename.rsplit('.', 1)[0] if '.' in filename else filename,
-            use_filename=True,
-            unique_filename=True,
-        )
+        if isinstance(file_bytes, (bytes, bytearray)):
+            result = await cls._call_api(
+                'upload', params, resource_type, file=(filename, file_bytes)
+            )
+        else:
+            result = await cls._upload_stream(file_bytes, filename, params, resource_type)
         
         return result['secure_url'], result['public_id']
     
     @classmethod
-    def delete(cls, public_id: str, resource_type: str = "auto") -> bool:
+    async def _upload_stream(
+        cls,
+        stream: BinaryIO,
+        filename: str,
+        params: dict[str, Any],
+        resource_type: str
+    ) -> dict[str, Any]:
+        """
+        Upload a binary file without reading it into memory at once.
+        
+        Small files are read in a worker thread and sent in one request;
+        larger ones use Cloudinary's chunked upload (Content-Range parts
+        sharing an X-Unique-Upload-Id), so at most UPLOAD_CHUNK_SIZE bytes
+        are held in memory.
+        """
+        size = stream.seek(0, 2)
+        stream.seek(0)
+        
+        if size <= UPLOAD_CHUNK_SIZE:
+            # httpx would read the sync file on the event loop; read it in a thread
+            content = await asyncio.to_thread(stream.read)
+            return await cls._call_api('upload', params, resource_type, file=(filename, content))
+        
+        upload_id = cloudinary.utils.random_public_id()
+        offset = 0
+        result: dict[str, Any] = {}
+        while chunk := await asyncio.to_thread(stream.read, UPLOAD_CHUNK_SIZE):
+            headers = {
+                'Content-Range': f'bytes {offset}-{offset + len(chunk) - 1}/{size}',
+                'X-Unique-Upload-Id': upload_id,
+            }
+            result = await cls._call_api(
+                'upload', params, resource_type, file=(filename, chunk), headers=headers
+            )
+            offset += len(chunk)
+            # Later parts must target the public_id assigned to the first one
+            params = {**params, 'public_id': result.get('public_id', params['public_id'])}
+        
+        return result
+    
+    @classmethod
+    async def delete(cls, public_id: str, resource_type: str = "auto") -> bool:
         """
         Delete a file from Cloudinary.
         
@@ -85,12 +199,12 @@ class CloudinaryService:
         """
         try:
             # Try as raw first (for documents)
-            result = cloudinary.uploader.destroy(public_id, resource_type='raw')
+            result = await cls._call_api('destroy', {'public_id': public_id}, 'raw')
             if result.get('result') == 'ok':
                 return True
             
             # Try as image
-            result = cloudinary.uploader.destroy(public_id, resource_type='image')
+            result = await cls._call_api('destroy', {'public_id': public_id}, 'image')
             return result.get('result') == 'ok'
         except Exception:
             return False
@@ -5,12 +5,23 @@ Handles text extraction from PDF and DOCX files.
 Validates file types and handles corrupted/unreadable files gracefully.
 """
 
+import re
 from io import BytesIO
-from typing import Tuple
+from typing import BinaryIO, Iterator, Tuple, Union
+
+from rag.services.file_types import get_file_extension
 
 
 # Supported file extensions
-ALLOWED_EXTENSIONS = {'pdf', 'docx'}
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'docx'})
+
+# Raw bytes or a seekable binary file (e.g. Django's uploaded file)
+FileContent = Union[bytes, BinaryIO]
+
+# Text cleanup patterns (compiled once)
+_MULTI_NL = re.compile(r'\n{3,}')
+_MULTI_SP = re.compile(r'[ \t]+')
+_LINE_TRIM = re.compile(r'[ \t]*\n[ \t]*')
 
 
 class DocumentProcessorError(Exception):
@@ -29,9 +40,7 @@ class DocumentProcessor:
     @staticmethod
     def get_file_extension(filename: str) -> str:
         """Extract lowercase file extension without the dot."""
-        if '.' not in filename:
-            return ''
-        return filename.rsplit('.', 1)[1].lower()
+        return get_file_extension(filename)
     
     @staticmethod
     def is_supported(filename: str) -> bool:
@@ -40,17 +49,44 @@ class DocumentProcessor:
         return ext in ALLOWED_EXTENSIONS
     
     @classmethod
-    def extract_text(cls, file_content: bytes, filename: str) -> Tuple[str, str]:
+    def extract_text(cls, file_content: FileContent, filename: str) -> Tuple[str, str]:
         """
         Extract text from a document file.
         
         Args:
-            file_content: The raw bytes of the uploaded file
+            file_content: The raw bytes of the uploaded file, or a seekable
+                binary file (read from the start, without copying into memory)
             filename: Original filename to determine file type
             
         Returns:
             Tuple of (extracted_text, doc_type)
             
+        Raises:
+            DocumentProcessorError: If file type unsupported or extraction fails
+        """
+        text = '\n\n'.join(cls.iter_pages(file_content, filename))
+        
+        if not text.strip():
+            raise DocumentProcessorError("No text content found in document")
+        
+        return text, cls.get_file_extension(filename)
+    
+    @classmethod
+    def iter_pages(cls, file_content: FileContent, filename: str) -> Iterator[str]:
+        """
+        Lazily yield cleaned, non-empty text per PDF page / DOCX paragraph.
+        
+        Lets callers chunk page by page without building the whole
+        document as one string. Must be consumed in a sync context.
+        
+        Args:
+            file_content: The raw bytes of the uploaded file, or a seekable
+                binary file (read from the start, without copying into memory)
+            filename: Original filename to determine file type
+            
+        Yields:
+            Cleaned page (or paragraph) text
+            
         Raises:
             DocumentProcessorError: If file type unsupported or extraction fails
         """
@@ -61,62 +97,57 @@ class DocumentProcessor:
                 f"Unsupported file type: {ext}. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
+        extract = cls._extract_pdf if ext == 'pdf' else cls._extract_docx
+        
         try:
-            if ext == 'pdf':
-                text = cls._extract_pdf(file_content)
-            else:  # docx
-                text = cls._extract_docx(file_content)
-            
-            # Clean up extracted text
-            text = cls._clean_text(text)
-            
-            if not text.strip():
-                raise DocumentProcessorError("No text content found in document")
-            
-            return text, ext
-            
+            for page_text in extract(file_content):
+                # Clean up extracted text
+                page_text = cls._clean_text(page_text)
+                if page_text.strip():
+                    yield page_text
         except DocumentProcessorError:
             raise
         except Exception as e:
             raise DocumentProcessorError(f"Failed to extract text: {str(e)}")
     
     @staticmethod
-    def _extract_pdf(content: bytes) -> str:
-        """Extract text from PDF using pypdf."""
+    def _as_stream(content: FileContent) -> BinaryIO:
+        """Wrap raw bytes in a stream, or rewind an existing file."""
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return BytesIO(content)
+        content.seek(0)
+        return content
+    
+    @staticmethod
+    def _extract_pdf(content: FileContent) -> Iterator[str]:
+        """Yield text per PDF page using pypdf."""
         from pypdf import PdfReader
         
-        reader = PdfReader(BytesIO(content))
-        text_parts = []
+        reader = PdfReader(DocumentProcessor._as_stream(content))
         
         for page in reader.pages:
             page_text = page.extract_text()
             if page_text:
-                text_parts.append(page_text)
-        
-        return '\n\n'.join(text_parts)
+                yield page_text
     
     @staticmethod
-    def _extract_docx(content: bytes) -> str:
-        """Extract text from DOCX using python-docx."""
+    def _extract_docx(content: FileContent) -> Iterator[str]:
+        """Yield text per DOCX paragraph using python-docx."""
         from docx import Document
         
-        doc = Document(BytesIO(content))
-        text_parts = []
+        doc = Document(DocumentProcessor._as_stream(content))
         
         for paragraph in doc.paragraphs:
             if paragraph.text.strip():
-                text_parts.append(paragraph.text)
-        
-        return '\n\n'.join(text_parts)
+                yield paragraph.text
     
     @staticmethod
     def _clean_text(text: str) -> str:
         """Clean and normalize extracted text."""
+        # Replace runs of spaces/tabs with a single space
+        text = _MULTI_SP.sub(' ', text)
+        # Strip leading/trailing whitespace from each line (single regex pass)
+        text = _LINE_TRIM.sub('\n', text)
         # Replace multiple newlines with double newline
-        import re
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        # Replace multiple spaces with single space
-        text = re.sub(r' +', ' ', text)
-        # Strip leading/trailing whitespace from each line
-        lines = [line.strip() for line in text.split('\n')]
-        return '\n'.join(lines)
+        text = _MULTI_NL.sub('\n\n', text)
+        return text.strip()
@@ -2,15 +2,30 @@
 Local Embeddings Service using sentence-transformers.
 
 Uses all-MiniLM-L6-v2 model (384 dimensions) - free and runs locally.
+Model inference runs in a worker thread so it never blocks the event loop.
 """
 
+import asyncio
+import hashlib
 from typing import List
 from functools import lru_cache
 
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
 
 # Model produces 384-dimensional embeddings
 EMBEDDING_DIMENSIONS = 384
 MODEL_NAME = 'all-MiniLM-L6-v2'
+# Texts per forward pass when embedding in bulk
+DEFAULT_BATCH_SIZE = 32
+# Single-text requests arriving within this window are encoded together
+MICRO_BATCH_WINDOW_SECONDS = 0.005
+MICRO_BATCH_MAX_SIZE = 64
+# Chunk embeddings are cached by (model, text hash) so re-uploads skip the model
+EMBEDDING_CACHE_PREFIX = f'emb:{MODEL_NAME}:'
+EMBEDDING_CACHE_TIMEOUT = 7 * 86400  # 7 days
 
 
 @lru_cache(maxsize=1)
@@ -18,9 +33,93 @@ def _get_model():
     """
     Lazy load the sentence transformer model.
     Cached to avoid reloading on every request.
+    
+    Uses CUDA with FP16 weights when a GPU is available, CPU FP32 otherwise.
     """
+    import torch
     from sentence_transformers import SentenceTransformer
-    return SentenceTransformer(MODEL_NAME)
+    
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = SentenceTransformer(MODEL_NAME, device=device)
+    if device == 'cuda':
+        model = model.half()
+    return model
+
+
+def _encode(texts: List[str], batch_size: int) -> np.ndarray:
+    """Blocking batched encode; call via asyncio.to_thread."""
+    embeddings = _get_model().encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        convert_to_tensor=False,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+    # FP16 (GPU) outputs are widened so callers always get float32
+    return embeddings.astype(np.float32, copy=False)
+
+
+class _EmbeddingMicroBatcher:
+    """
+    Coalesces concurrent single-text embedding requests.
+    
+    Requests are queued with a future; a background task drains whatever
+    arrives within a short window and encodes it in one forward pass.
+    State is bound to the running event loop and recreated if it changes.
+    """
+    
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+    
+    async def embed(self, text: str) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + MICRO_BATCH_WINDOW_SECONDS
+            while len(batch) < MICRO_BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Skip requests whose callers were cancelled while queued
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            
+            try:
+                embeddings = await asyncio.to_thread(
+                    _encode, [text for text, _ in batch], MICRO_BATCH_MAX_SIZE
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+_micro_batcher = _EmbeddingMicroBatcher()
 
 
 class EmbeddingsService:
@@ -32,35 +131,76 @@ class EmbeddingsService:
     """
     
     @classmethod
-    async def generate_embedding(cls, text: str) -> List[float]:
+    async def generate_embedding(cls, text: str) -> np.ndarray:
         """
         Generate embedding vector for a single text.
         
+        Concurrent calls are micro-batched into a single forward pass.
+        
         Args:
             text: The text to embed
-            
+        
         Returns:
-            List of floats representing the embedding vector (384 dimensions)
+            float32 numpy array representing the embedding vector (384 dimensions),
+            which can be passed directly as a pgvector query parameter
         """
-        model = _get_model()
-        # sentence-transformers is sync, but fast enough for single texts
-        embedding = model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return await _micro_batcher.embed(text)
     
     @classmethod
-    async def generate_embeddings(cls, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings(
+        cls,
+        texts: List[str],
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> np.ndarray:
         """
         Generate embeddings for multiple texts in a batch.
         
-        Sentence-transformers handles batching internally for efficiency.
+        Previously embedded texts are served from the cache, and repeated
+        texts (boilerplate headers/footers) are encoded once. The rest are
+        encoded one batch per worker-thread hop (one GEMM per batch instead
+        of one GEMV per text), so peak memory stays flat for large documents
+        and other requests can be served between batches.
         
         Args:
             texts: List of texts to embed
-            
+            batch_size: Texts per forward pass
+        
         Returns:
-            List of embedding vectors in the same order as input texts
+            float32 array of shape (len(texts), 384), rows in input order
         """
-        model = _get_model()
-        # Batch encode is very efficient
-        embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-        return [emb.tolist() for emb in embeddings]
+        embeddings = np.empty((len(texts), EMBEDDING_DIMENSIONS), dtype=np.float32)
+        if not texts:
+            return embeddings
+        
+        keys = [cls._cache_key(text) for text in texts]
+        cached = await sync_to_async(cache.get_many)(keys)
+        
+        # Rows still to embed, grouped by text so duplicates are encoded once
+        missing: dict[str, list[int]] = {}
+        for i, key in enumerate(keys):
+            raw = cached.get(key)
+            if raw is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                embeddings[i] = np.frombuffer(raw, dtype=np.float32)
+        
+        pending = list(missing.values())
+        for start in range(0, len(pending), batch_size):
+            groups = pending[start:start + batch_size]
+            batch = [texts[rows[0]] for rows in groups]
+            encoded = await asyncio.to_thread(_encode, batch, batch_size)
+            for rows, embedding in zip(groups, encoded):
+                embeddings[rows] = embedding
+        
+        if missing:
+            await sync_to_async(cache.set_many)(
+                {key: embeddings[rows[0]].tobytes() for key, rows in missing.items()},
+                timeout=EMBEDDING_CACHE_TIMEOUT
+            )
+        
+        return embeddings
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Build a content-addressed cache key for a chunk text."""
+        return EMBEDDING_CACHE_PREFIX + hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
@@ -0,0 +1,24 @@
+"""
+File type helpers shared by the upload services.
+
+One place for extension parsing and the extension -> Cloudinary
+resource_type mapping.
+"""
+
+# Images handled by ImageProcessor (OCR + Vision)
+IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'webp'})
+# Documents Cloudinary must store as resource_type="raw"
+RAW_EXTENSIONS = frozenset({'pdf', 'docx', 'doc', 'txt'})
+
+_RT_MAP = {ext: 'raw' for ext in RAW_EXTENSIONS} | {ext: 'image' for ext in IMAGE_EXTENSIONS}
+
+
+def get_file_extension(filename: str) -> str:
+    """Extract lowercase file extension without the dot ('' if none)."""
+    _, dot, ext = filename.rpartition('.')
+    return ext.lower() if dot else ''
+
+
+def resource_type_for(filename: str, default: str = 'auto') -> str:
+    """Map a filename to its Cloudinary resource_type."""
+    return _RT_MAP.get(get_file_extension(filename), default)
@@ -0,0 +1,28 @@
+"""
+Shared outbound HTTP client.
+
+One pooled HTTP/2 client for every external API (OpenAI, Cloudinary), so
+calls reuse warm TCP+TLS connections and concurrent requests to the same
+host multiplex over them instead of each paying a fresh handshake.
+"""
+
+import httpx
+
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get or create the shared async HTTP client."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(120.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=30.0
+            )
+        )
+    return _client
@@ -4,12 +4,25 @@ Image Processor combining OCR and Vision services.
 Handles image ingestion with intelligent Vision API triggering.
 """
 
-from typing import Tuple
+import asyncio
+import hashlib
+import logging
 from asgiref.sync import sync_to_async
-from rag.services.ocr_service import OCRService
+from django.core.cache import cache
+from rag.services.file_types import IMAGE_EXTENSIONS, get_file_extension
+from rag.services.ocr_service import OCRResult, OCRService
 from rag.services.vision_service import VisionService
 
 
+# OCR and Vision output depend only on the image bytes, so both are cached
+# by content hash and re-uploads of the same image skip Tesseract and the API
+OCR_CACHE_PREFIX = 'ocr:'
+VISION_CACHE_PREFIX = 'vision:'
+IMAGE_CACHE_TIMEOUT = 7 * 86400  # 7 days
+
+logger = logging.getLogger(__name__)
+
+
 class ImageProcessor:
     """
     Processes images for RAG using OCR + conditional Vision.
@@ -21,6 +34,17 @@ class ImageProcessor:
     4. Merge OCR text + Vision description
     """
     
+    MAX_CONCURRENT_VISION_CALLS = 8  # In-flight Vision API requests per process
+    
+    _vision_semaphore: asyncio.Semaphore | None = None
+    
+    @classmethod
+    def _get_vision_semaphore(cls) -> asyncio.Semaphore:
+        """Get or create the semaphore bounding concurrent Vision API calls."""
+        if cls._vision_semaphore is None:
+            cls._vision_semaphore = asyncio.Semaphore(cls.MAX_CONCURRENT_VISION_CALLS)
+        return cls._vision_semaphore
+    
     @classmethod
     async def process_image(cls, image_bytes: bytes, cloudinary_url: str) -> str:
         """
@@ -33,25 +57,69 @@ class ImageProcessor:
         Returns:
             Combined text (OCR + optional Vision description)
         """
-        import logging
-        logger = logging.getLogger(__name__)
+        ocr_result = await cls.run_ocr(image_bytes)
+        return await cls.add_vision(image_bytes, ocr_result, cloudinary_url)
+    
+    @classmethod
+    async def run_ocr(cls, image_bytes: bytes) -> OCRResult:
+        """
+        Phase 1: OCR with quality signals.
         
-        logger.info(f"[ImageProcessor] Starting OCR for image ({len(image_bytes)} bytes)")
+        Needs only the image bytes, so callers can run it while the image
+        is still uploading to Cloudinary.
         
-        # Run OCR with signal detection (CPU-intensive, wrap in sync_to_async)
-        ocr_result = await sync_to_async(
-            OCRService.extract_text_and_signals
-        )(image_bytes)
+        Args:
+            image_bytes: Raw image bytes
+            
+        Returns:
+            OCRResult (cached by image content hash)
+        """
+        ocr_key = OCR_CACHE_PREFIX + cls._digest(image_bytes)
+        ocr_result = await sync_to_async(cache.get)(ocr_key)
+        if ocr_result is None:
+            logger.info(f"[ImageProcessor] Starting OCR for image ({len(image_bytes)} bytes)")
+            
+            # Run OCR with signal detection (CPU-intensive, run in the OCR process pool)
+            ocr_result = await OCRService.extract_in_pool(image_bytes)
+            await sync_to_async(cache.set)(ocr_key, ocr_result, timeout=IMAGE_CACHE_TIMEOUT)
         
         logger.info(f"[ImageProcessor] OCR complete - confidence: {ocr_result.confidence:.1f}, needs_vision: {ocr_result.needs_vision}")
+        return ocr_result
+    
+    @classmethod
+    async def add_vision(
+        cls,
+        image_bytes: bytes,
+        ocr_result: OCRResult,
+        cloudinary_url: str
+    ) -> str:
+        """
+        Phase 2: call Vision if the OCR signals are poor, and merge.
         
+        Args:
+            image_bytes: Raw image bytes (cache key for the description)
+            ocr_result: Result of run_ocr()
+            cloudinary_url: Cloudinary URL for Vision API
+            
+        Returns:
+            Combined text (OCR + optional Vision description)
+        """
         # Start with OCR text
         final_text = ocr_result.text
         
         # If signals indicate complex visual content, use Vision API
         if ocr_result.needs_vision:
-            logger.info("[ImageProcessor] Calling Vision API...")
-            vision_description = await VisionService.describe_image(cloudinary_url)
+            vision_key = VISION_CACHE_PREFIX + cls._digest(image_bytes)
+            vision_description = await sync_to_async(cache.get)(vision_key)
+            if vision_description is None:
+                logger.info("[ImageProcessor] Calling Vision API...")
+                async with cls._get_vision_semaphore():
+                    vision_description = await VisionService.describe_image(cloudinary_url)
+                # An empty reply may be a transient failure; don't pin it for a week
+                if vision_description:
+                    await sync_to_async(cache.set)(
+                        vision_key, vision_description, timeout=IMAGE_CACHE_TIMEOUT
+                    )
             logger.info(f"[ImageProcessor] Vision API returned: {len(vision_description)} chars")
             
             # Merge: Vision description first, then OCR text
@@ -61,8 +129,12 @@ class ImageProcessor:
         logger.info(f"[ImageProcessor] Final text: {len(final_text)} chars")
         return final_text
     
+    @staticmethod
+    def _digest(image_bytes: bytes) -> str:
+        """Content hash used for the OCR and Vision cache keys."""
+        return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+    
     @classmethod
     def is_supported_image(cls, filename: str) -> bool:
         """Check if file is a supported image format."""
-        ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
-        return ext in ('png', 'jpg', 'jpeg', 'gif', 'webp')
+        return get_file_extension(filename) in IMAGE_EXTENSIONS
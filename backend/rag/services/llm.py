@@ -5,10 +5,13 @@ Provides a unified interface for LLM completions using OpenAI's API.
 Supports both regular chat completions and JSON mode for structured outputs.
 """
 
+import asyncio
 import os
+import time
 from typing import Any
-import httpx
+import orjson
 from openai import AsyncOpenAI
+from rag.services.http import get_client
 
 
 # Configuration
@@ -18,6 +21,10 @@ DEFAULT_MODEL = os.getenv('OPENAI_LLM_MODEL', 'gpt-4.1-mini')
 DEFAULT_TEMPERATURE = 0.7
 # Lower temperature for classification tasks
 CLASSIFICATION_TEMPERATURE = 0.0
+# Streamed tokens are coalesced into one fragment per this many tokens...
+STREAM_FLUSH_TOKENS = 16
+# ...or once this long has passed since the last fragment
+STREAM_FLUSH_SECONDS = 0.02
 
 
 class LLMService:
@@ -34,12 +41,16 @@ class LLMService:
     def _get_client(cls) -> AsyncOpenAI:
         """Get or create the OpenAI async client."""
         if cls._client is None:
-            cls._client = AsyncOpenAI(
-                api_key=OPENAI_API_KEY,
-                http_client=httpx.AsyncClient(timeout=120.0)
-            )
+            # Share the pooled HTTP/2 client so concurrent completions
+            # multiplex over warm TCP+TLS sessions
+            cls._client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=get_client())
         return cls._client
     
+    @staticmethod
+    def _cache_kwargs(prompt_cache_key: str | None) -> dict[str, Any]:
+        """Extra request kwargs for provider-side prompt prefix caching."""
+        return {"prompt_cache_key": prompt_cache_key} if prompt_cache_key else {}
+    
     @classmethod
     async def complete(
         cls,
@@ -47,7 +58,8 @@ class LLMService:
         user_message: str,
         model: str | None = None,
         temperature: float | None = None,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        prompt_cache_key: str | None = None
     ) -> str:
         """
         Generate a chat completion.
@@ -58,6 +70,8 @@ class LLMService:
             model: Override the default model
             temperature: Override the default temperature (0.0-1.0)
             max_tokens: Maximum tokens in the response
+            prompt_cache_key: Optional key grouping requests that share the
+                system prompt, improving provider prefix-cache hits
             
         Returns:
             The assistant's response text
@@ -70,7 +84,8 @@ class LLMService:
                 {"role": "user", "content": user_message}
             ],
             temperature=temperature if temperature is not None else DEFAULT_TEMPERATURE,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            **cls._cache_kwargs(prompt_cache_key)
         )
         return response.choices[0].message.content or ""
     
@@ -99,8 +114,6 @@ class LLMService:
         Returns:
             Parsed JSON response as a dictionary
         """
-        import json
-        
         client = cls._get_client()
         response = await client.chat.completions.create(
             model=model or DEFAULT_MODEL,
@@ -113,7 +126,7 @@ class LLMService:
             response_format={"type": "json_object"}
         )
         content = response.choices[0].message.content or "{}"
-        return json.loads(content)
+        return orjson.loads(content)
     
     @classmethod
     async def complete_with_vision(
@@ -158,10 +171,16 @@ class LLMService:
         user_message: str,
         model: str | None = None,
         temperature: float | None = None,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        prompt_cache_key: str | None = None
     ):
         """
-        Stream a chat completion token by token.
+        Stream a chat completion as it is generated.
+        
+        Tokens are coalesced into fragments of up to STREAM_FLUSH_TOKENS
+        tokens, so callers write fewer, larger frames. Buffered tokens are
+        flushed on a timer STREAM_FLUSH_SECONDS after the last fragment, so
+        a slow model never holds them back waiting for the next token.
         
         Args:
             system_prompt: The system instructions
@@ -169,9 +188,11 @@ class LLMService:
             model: Override the default model
             temperature: Override the default temperature
             max_tokens: Maximum tokens in the response
+            prompt_cache_key: Optional key grouping requests that share the
+                system prompt, improving provider prefix-cache hits
             
         Yields:
-            String tokens as they are generated
+            Text fragments (one or more tokens) in generation order
         """
         client = cls._get_client()
         stream = await client.chat.completions.create(
@@ -182,9 +203,52 @@ class LLMService:
             ],
             temperature=temperature if temperature is not None else DEFAULT_TEMPERATURE,
             max_tokens=max_tokens,
-            stream=True
+            stream=True,
+            **cls._cache_kwargs(prompt_cache_key)
         )
         
-        async for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        chunks = aiter(stream)
+        buffer: list[str] = []
+        last_flush = time.monotonic()
+        next_chunk: asyncio.Task | None = None
+        try:
+            while True:
+                if next_chunk is None:
+                    next_chunk = asyncio.ensure_future(anext(chunks))
+                
+                # Wait for the next chunk, but only until the flush deadline
+                # while tokens are buffered (asyncio.wait leaves the read running)
+                timeout = None
+                if buffer:
+                    timeout = max(0.0, last_flush + STREAM_FLUSH_SECONDS - time.monotonic())
+                done, _ = await asyncio.wait((next_chunk,), timeout=timeout)
+                
+                if not done:
+                    yield ''.join(buffer)
+                    buffer.clear()
+                    last_flush = time.monotonic()
+                    continue
+                
+                finished, next_chunk = next_chunk, None
+                try:
+                    chunk = finished.result()
+                except StopAsyncIteration:
+                    break
+                
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                
+                buffer.append(content)
+                now = time.monotonic()
+                if len(buffer) >= STREAM_FLUSH_TOKENS or now - last_flush >= STREAM_FLUSH_SECONDS:
+                    yield ''.join(buffer)
+                    buffer.clear()
+                    last_flush = now
+        finally:
+            # Consumer went away mid-stream: stop the pending read
+            if next_chunk is not None:
+                next_chunk.cancel()
+        
+        if buffer:
+            yield ''.join(buffer)
@@ -2,12 +2,30 @@
 OCR Service using Tesseract with intelligent signal detection.
 """
 
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+import numpy as np
 from PIL import Image
 import pytesseract
 import io
 from django.conf import settings
 
+try:
+    import cv2  # Optional: SIMD-accelerated downscaling
+except ImportError:
+    cv2 = None
+
+
+# Pillow modes that map to plain pixel arrays OpenCV can resample
+_CV2_RESIZE_MODES = {'L', 'RGB', 'RGBA'}
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class OCRResult:
@@ -23,6 +41,54 @@ class OCRService:
     """Tesseract OCR with intelligent Vision API triggering."""
     
     MAX_IMAGE_SIZE = 2000  # Max dimension for OCR processing
+    MIN_IMAGE_SIZE = 200  # Below this (shortest side), OCR is skipped
+    
+    _pool: ProcessPoolExecutor | None = None
+    
+    @classmethod
+    def get_pool(cls) -> ProcessPoolExecutor:
+        """
+        Get or create the process pool used to run OCR off the GIL.
+        
+        Created lazily so management commands and workers that never
+        OCR don't spawn processes. Only the image bytes cross the
+        process boundary. Workers come from a forkserver rather than a
+        fork of this (multithreaded) process, so they never inherit locks
+        held by executor or torch threads.
+        """
+        if cls._pool is None:
+            cls._pool = ProcessPoolExecutor(
+                max_workers=max(1, (os.cpu_count() or 2) - 1),
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+        return cls._pool
+    
+    @classmethod
+    def _discard_pool(cls, pool: ProcessPoolExecutor) -> None:
+        """Drop a broken pool so the next get_pool() creates a fresh one."""
+        # A concurrent caller may already have replaced it
+        if cls._pool is pool:
+            cls._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    @classmethod
+    async def extract_in_pool(cls, image_bytes: bytes) -> OCRResult:
+        """
+        Run extract_text_and_signals in the process pool.
+        
+        A worker that dies (OOM on a huge image, a Tesseract crash) breaks
+        the whole pool; it is replaced and the image retried once. Errors
+        raised by OCR itself come back as RuntimeError (see _extract_in_worker)
+        and are not retried.
+        """
+        loop = asyncio.get_running_loop()
+        pool = cls.get_pool()
+        try:
+            return await loop.run_in_executor(pool, _extract_in_worker, image_bytes)
+        except BrokenProcessPool:
+            logger.warning("[OCR] Process pool broken, recreating it and retrying")
+            cls._discard_pool(pool)
+            return await loop.run_in_executor(cls.get_pool(), _extract_in_worker, image_bytes)
     
     @classmethod
     def _resize_if_needed(cls, image: Image.Image) -> Image.Image:
@@ -34,6 +100,18 @@ class OCRService:
         # Scale down preserving aspect ratio
         ratio = min(cls.MAX_IMAGE_SIZE / width, cls.MAX_IMAGE_SIZE / height)
         new_size = (int(width * ratio), int(height * ratio))
+        
+        # Let libjpeg downscale during decode (DCT scaling) to at least new_size;
+        # the mode is kept so OCR input doesn't depend on size or format
+        if image.format == 'JPEG':
+            image.draft(image.mode, new_size)
+            if image.size == new_size:
+                return image
+        
+        if cv2 is not None and image.mode in _CV2_RESIZE_MODES:
+            resized = cv2.resize(np.asarray(image), new_size, interpolation=cv2.INTER_AREA)
+            return Image.fromarray(resized)
+        
         return image.resize(new_size, Image.Resampling.LANCZOS)
     
     @classmethod
@@ -41,45 +119,60 @@ class OCRService:
         """Extract text and compute quality signals."""
         image = Image.open(io.BytesIO(image_bytes))
         
+        # Too small to hold readable text: skip Tesseract, go straight to Vision
+        if min(image.size) < cls.MIN_IMAGE_SIZE:
+            return OCRResult('', 0.0, 0.0, 0.0, True)
+        
         # Resize large images to prevent OCR timeout
         image = cls._resize_if_needed(image)
         
-        # Get detailed OCR data
+        # Single Tesseract pass; the plain text is rebuilt from the word data
         ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-        text = pytesseract.image_to_string(image).strip()
+        text = cls._text_from_data(ocr_data)
         
         # Calculate signals
-        confidence = cls._calculate_confidence(ocr_data)
-        text_coverage = cls._calculate_text_coverage(ocr_data, image)
-        box_density = cls._calculate_box_density(ocr_data, image)
+        confidence, text_coverage, box_density = cls._signals(ocr_data, image)
         needs_vision = cls._needs_vision_api(text_coverage, box_density, confidence)
         
         return OCRResult(text, confidence, text_coverage, box_density, needs_vision)
     
     @classmethod
-    def _calculate_confidence(cls, ocr_data: dict) -> float:
-        """Average OCR confidence from valid detections."""
-        confidences = [float(c) for c in ocr_data['conf'] if c != -1]
-        return sum(confidences) / len(confidences) if confidences else 0.0
+    def _text_from_data(cls, ocr_data: dict) -> str:
+        """Rebuild the plain text from image_to_data output, one line per OCR line."""
+        lines: dict[tuple[int, int, int], list[str]] = {}
+        for word, conf, block, par, line in zip(
+            ocr_data['text'], ocr_data['conf'],
+            ocr_data['block_num'], ocr_data['par_num'], ocr_data['line_num']
+        ):
+            if conf != -1 and word.strip():
+                lines.setdefault((block, par, line), []).append(word)
+        return '\n'.join(' '.join(words) for words in lines.values())
     
     @classmethod
-    def _calculate_text_coverage(cls, ocr_data: dict, image: Image.Image) -> float:
-        """Percentage of image covered by text boxes."""
-        image_area = image.width * image.height
-        total_text_area = sum(
-            ocr_data['width'][i] * ocr_data['height'][i]
-            for i in range(len(ocr_data['text']))
-            if ocr_data['conf'][i] != -1
-        )
-        return min(total_text_area / image_area, 1.0) if image_area > 0 else 0.0
-    
-    @classmethod
-    def _calculate_box_density(cls, ocr_data: dict, image: Image.Image) -> float:
-        """Density of text boxes in image."""
-        valid_boxes = sum(1 for c in ocr_data['conf'] if c != -1)
+    def _signals(cls, ocr_data: dict, image: Image.Image) -> tuple[float, float, float]:
+        """
+        Compute (confidence, text_coverage, box_density) in one vectorized pass.
+        
+        - confidence: average OCR confidence of valid detections
+        - text_coverage: fraction of the image covered by valid text boxes
+        - box_density: valid boxes relative to a dense-text expectation
+        """
+        conf = np.asarray(ocr_data['conf'], dtype=np.float32)
+        width = np.asarray(ocr_data['width'], dtype=np.int64)
+        height = np.asarray(ocr_data['height'], dtype=np.int64)
+        valid = conf != -1
+        
+        valid_boxes = int(valid.sum())
+        confidence = float(conf[valid].mean()) if valid_boxes else 0.0
+        
         image_area = image.width * image.height
+        total_text_area = int((width[valid] * height[valid]).sum())
+        text_coverage = min(total_text_area / image_area, 1.0) if image_area > 0 else 0.0
+        
         expected_dense = image_area / 10000
-        return min(valid_boxes / expected_dense, 1.0) if expected_dense > 0 else 0.0
+        box_density = min(valid_boxes / expected_dense, 1.0) if expected_dense > 0 else 0.0
+        
+        return confidence, text_coverage, box_density
     
     @classmethod
     def _needs_vision_api(cls, text_coverage: float, box_density: float, confidence: float) -> bool:
@@ -89,3 +182,18 @@ class OCRService:
             box_density < settings.OCR_BOX_DENSITY_THRESHOLD or
             confidence < settings.OCR_CONFIDENCE_THRESHOLD
         )
+
+
+def _extract_in_worker(image_bytes: bytes) -> OCRResult:
+    """
+    Process pool entry point for OCRService.extract_text_and_signals.
+    
+    Exceptions travel back to the parent pickled, and some can't be rebuilt
+    there (pytesseract.TesseractNotFoundError takes no arguments), which
+    breaks the pool instead of failing the one call. Re-raise everything as
+    a plain RuntimeError carrying the original type and message.
+    """
+    try:
+        return OCRService.extract_text_and_signals(image_bytes)
+    except Exception as e:
+        raise RuntimeError(f"{type(e).__name__}: {e}") from e
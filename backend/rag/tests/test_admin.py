@@ -0,0 +1,66 @@
+"""
+Tests for the estimated-count admin paginator.
+"""
+
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from rag import admin
+from rag.admin import FasterAdminPaginator
+
+
+class FakeQuerySet(list):
+    """Minimal queryset: exact count() plus the query attributes the paginator reads."""
+    
+    def __init__(self, rows, filtered=False):
+        super().__init__(rows)
+        self.query = SimpleNamespace(
+            where=['user_id = 1'] if filtered else [],
+            model=SimpleNamespace(_meta=SimpleNamespace(db_table='document_chunks'))
+        )
+        self.count_calls = 0
+    
+    def count(self):
+        self.count_calls += 1
+        return len(self)
+
+
+class FasterAdminPaginatorTests(SimpleTestCase):
+    
+    def setUp(self):
+        self.cursor = mock.MagicMock()
+        connection = mock.MagicMock()
+        connection.cursor.return_value.__enter__.return_value = self.cursor
+        patcher = mock.patch.object(admin, 'connection', connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_unfiltered_uses_planner_estimate(self):
+        self.cursor.fetchone.return_value = (125000,)
+        rows = FakeQuerySet(range(7))
+        
+        self.assertEqual(FasterAdminPaginator(rows, 25).count, 125000)
+        self.assertEqual(rows.count_calls, 0)
+        self.assertEqual(self.cursor.execute.call_args.args[1], ['document_chunks'])
+    
+    def test_filtered_falls_back_to_exact_count(self):
+        rows = FakeQuerySet(range(7), filtered=True)
+        
+        self.assertEqual(FasterAdminPaginator(rows, 25).count, 7)
+        self.assertEqual(rows.count_calls, 1)
+        self.cursor.execute.assert_not_called()
+    
+    def test_unanalyzed_table_falls_back_to_exact_count(self):
+        for estimate in ((-1,), (0,), None):
+            with self.subTest(estimate=estimate):
+                self.cursor.fetchone.return_value = estimate
+                rows = FakeQuerySet(range(7))
+                
+                self.assertEqual(FasterAdminPaginator(rows, 25).count, 7)
+                self.assertEqual(rows.count_calls, 1)
+    
+    def test_plain_lists_use_len(self):
+        self.assertEqual(FasterAdminPaginator(list(range(3)), 25).count, 3)
+        self.cursor.execute.assert_not_called()
@@ -0,0 +1,41 @@
+"""
+Tests for the pgvector connection hook.
+"""
+
+from unittest import mock
+
+import psycopg2
+from django.test import SimpleTestCase
+
+from rag import apps
+
+
+class RegisterPgvectorTests(SimpleTestCase):
+    
+    def setUp(self):
+        patcher = mock.patch.object(apps, '_pgvector_registered', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection = mock.Mock(vendor='postgresql')
+    
+    def test_missing_vector_type_is_skipped_and_retried(self):
+        with mock.patch('pgvector.psycopg2.register_vector') as register:
+            register.side_effect = psycopg2.ProgrammingError('vector type not found in the database')
+            apps._register_pgvector(sender=None, connection=self.connection)
+            self.assertFalse(apps._pgvector_registered)
+            
+            register.side_effect = None
+            apps._register_pgvector(sender=None, connection=self.connection)
+            self.assertTrue(apps._pgvector_registered)
+            self.assertEqual(register.call_count, 2)
+    
+    def test_registers_only_once(self):
+        with mock.patch('pgvector.psycopg2.register_vector') as register:
+            apps._register_pgvector(sender=None, connection=self.connection)
+            apps._register_pgvector(sender=None, connection=self.connection)
+        register.assert_called_once_with(self.connection.connection, globally=True)
+    
+    def test_ignores_other_backends(self):
+        with mock.patch('pgvector.psycopg2.register_vector') as register:
+            apps._register_pgvector(sender=None, connection=mock.Mock(vendor='sqlite'))
+        register.assert_not_called()
@@ -0,0 +1,59 @@
+"""
+Tests for the SSE chat endpoint's final events.
+"""
+
+import uuid
+from unittest import mock
+
+import orjson
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from rag import views
+
+
+async def _tokens(question, chunks):
+    yield {'type': 'token', 'content': 'Hi'}
+    yield {'type': 'done', 'used_context': False, 'sources': None}
+
+
+class ChatStreamTests(SimpleTestCase):
+    
+    def setUp(self):
+        self.session = mock.Mock(id=uuid.uuid4())
+        for target, attribute, new in (
+            (views, '_load_session_and_save_user', mock.Mock(return_value=self.session)),
+            (views, '_classify_and_retrieve', mock.AsyncMock(return_value=('GENERAL', None))),
+            (views.Generator, 'stream_generate', _tokens),
+        ):
+            patcher = mock.patch.object(target, attribute, new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.create = mock.Mock()
+        patcher = mock.patch.object(views.ChatMessage, 'objects', mock.Mock(create=self.create))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    async def events(self) -> list[dict]:
+        request = APIRequestFactory().post('/api/chat/stream', {'message': 'hello'}, format='json')
+        force_authenticate(request, user=mock.Mock(id=uuid.uuid4(), is_authenticated=True))
+        response = await views.ChatStreamView.as_view()(request)
+        return [
+            orjson.loads(frame.removeprefix(b'data: '))
+            async for frame in response.streaming_content
+        ]
+    
+    async def test_done_follows_the_saved_message(self):
+        events = await self.events()
+        
+        self.assertEqual([e['type'] for e in events], ['session', 'token', 'done'])
+        self.create.assert_called_once_with(
+            session=self.session, role='assistant', content='Hi', used_context=False
+        )
+    
+    async def test_failed_save_sends_error_instead_of_done(self):
+        self.create.side_effect = RuntimeError('db down')
+        
+        events = await self.events()
+        
+        self.assertEqual([e['type'] for e in events], ['session', 'token', 'error'])
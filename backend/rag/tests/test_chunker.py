@@ -0,0 +1,74 @@
+"""
+Tests for token-window chunking.
+"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from rag.services.chunker import TextChunker
+
+
+class CharEncoder:
+    """One token per character, so chunk boundaries are easy to read."""
+    
+    def encode(self, text):
+        return [ord(c) for c in text]
+    
+    def encode_batch(self, texts):
+        return [self.encode(text) for text in texts]
+    
+    def decode(self, tokens):
+        return ''.join(chr(t) for t in tokens)
+    
+    def decode_batch(self, batch):
+        return [self.decode(tokens) for tokens in batch]
+
+
+def reference_chunks(encoder, tokens, chunk_size, chunk_overlap):
+    """The original per-window slicing loop chunk_tokens replaced."""
+    chunks = []
+    start = 0
+    while start < len(tokens):
+        end = min(start + chunk_size, len(tokens))
+        chunks.append(encoder.decode(tokens[start:end]))
+        start += chunk_size - chunk_overlap
+        if start <= 0:
+            start = chunk_size
+    return chunks
+
+
+class ChunkTokensTests(SimpleTestCase):
+    
+    def setUp(self):
+        self.encoder = CharEncoder()
+        patcher = mock.patch.object(TextChunker, '_get_encoder', return_value=self.encoder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_matches_reference_loop(self):
+        for n in (1, 7, 10, 11, 19, 20, 21, 57, 100):
+            for chunk_size, chunk_overlap in ((10, 0), (10, 3), (10, 9), (7, 2), (1, 0)):
+                tokens = self.encoder.encode(''.join(chr(ord('a') + i % 26) for i in range(n)))
+                with self.subTest(n=n, chunk_size=chunk_size, chunk_overlap=chunk_overlap):
+                    self.assertEqual(
+                        TextChunker.chunk_tokens(tokens, chunk_size, chunk_overlap),
+                        reference_chunks(self.encoder, tokens, chunk_size, chunk_overlap)
+                    )
+    
+    def test_tails_and_overlap(self):
+        chunks = TextChunker.chunk_tokens(self.encoder.encode('abcdefghijklm'), 5, 2)
+        self.assertEqual(chunks, ['abcde', 'defgh', 'ghijk', 'jklm', 'm'])
+    
+    def test_no_progress_overlap_falls_back_to_chunk_size_stride(self):
+        chunks = TextChunker.chunk_tokens(self.encoder.encode('abcdefgh'), 3, 3)
+        self.assertEqual(chunks, ['abc', 'def', 'gh'])
+    
+    def test_chunk_text_short_text_is_one_chunk(self):
+        self.assertEqual(TextChunker.chunk_text('short', chunk_size=10), ['short'])
+        self.assertEqual(TextChunker.chunk_text('   '), [])
+    
+    def test_chunk_pages_joins_pages_with_separator(self):
+        chunks = TextChunker.chunk_pages(['abcd', ' ', 'efgh'], chunk_size=6, chunk_overlap=2)
+        tokens = self.encoder.encode('abcd\n\nefgh')
+        self.assertEqual(chunks, reference_chunks(self.encoder, tokens, 6, 2))
@@ -0,0 +1,59 @@
+"""
+Tests for the Cloudinary Upload API client.
+"""
+
+import io
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase
+
+from rag.services import cloudinary_service
+from rag.services.cloudinary_service import CloudinaryService, CloudinaryServiceError
+
+
+class CallApiTests(SimpleTestCase):
+    
+    def setUp(self):
+        self.requests: list[httpx.Request] = []
+        self.response = httpx.Response(200, json={'secure_url': 'https://x', 'public_id': 'p'})
+        
+        def handler(request):
+            self.requests.append(request)
+            return self.response
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        for target, attribute, new in (
+            (cloudinary_service, 'get_client', mock.Mock(return_value=client)),
+            (cloudinary_service.cloudinary.utils, 'sign_request', mock.Mock(side_effect=lambda params, options: params)),
+            (cloudinary_service.cloudinary.utils, 'cloudinary_api_url', mock.Mock(return_value='https://api.test/upload')),
+        ):
+            patcher = mock.patch.object(target, attribute, new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    async def test_returns_json_result(self):
+        result = await CloudinaryService._call_api('upload', {}, 'raw')
+        self.assertEqual(result['public_id'], 'p')
+    
+    async def test_json_error_message_is_raised(self):
+        self.response = httpx.Response(400, json={'error': {'message': 'Invalid signature'}})
+        with self.assertRaisesMessage(CloudinaryServiceError, 'Invalid signature'):
+            await CloudinaryService._call_api('upload', {}, 'raw')
+    
+    async def test_non_json_error_body_raises_service_error(self):
+        self.response = httpx.Response(502, text='<html>Bad Gateway</html>')
+        with self.assertRaisesMessage(CloudinaryServiceError, 'Bad Gateway'):
+            await CloudinaryService._call_api('upload', {}, 'raw')
+    
+    async def test_empty_error_body_raises_service_error(self):
+        self.response = httpx.Response(413)
+        with self.assertRaisesMessage(CloudinaryServiceError, 'Too Large'):
+            await CloudinaryService._call_api('upload', {}, 'raw')
+    
+    async def test_small_stream_is_sent_in_one_request(self):
+        url, public_id = await CloudinaryService.upload(io.BytesIO(b'%PDF-1.4 small'), 'cv.pdf')
+        
+        self.assertEqual((url, public_id), ('https://x', 'p'))
+        self.assertEqual(len(self.requests), 1)
+        self.assertIn(b'%PDF-1.4 small', self.requests[0].read())
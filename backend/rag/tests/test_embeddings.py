@@ -0,0 +1,86 @@
+"""
+Tests for the embedding micro-batcher.
+"""
+
+import asyncio
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from rag.services import embeddings
+from rag.services.embeddings import _EmbeddingMicroBatcher
+
+
+def fake_encode(texts, batch_size):
+    """Encode each text as [index-in-name, length] so results are traceable."""
+    return np.array([[float(text.split('-')[1]), float(len(text))] for text in texts], dtype=np.float32)
+
+
+class MicroBatcherTests(SimpleTestCase):
+    
+    def setUp(self):
+        self.batches: list[list[str]] = []
+        
+        def encode(texts, batch_size):
+            self.batches.append(list(texts))
+            return fake_encode(texts, batch_size)
+        
+        patcher = mock.patch.object(embeddings, '_encode', side_effect=encode)
+        self.encode = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.batcher = _EmbeddingMicroBatcher()
+    
+    async def _stop_worker(self):
+        # The drain task runs forever; stop it before the test's loop closes
+        if self.batcher._worker is not None:
+            self.batcher._worker.cancel()
+    
+    async def _embed_all(self, texts):
+        try:
+            return await asyncio.gather(*(self.batcher.embed(text) for text in texts))
+        finally:
+            await self._stop_worker()
+    
+    async def test_concurrent_requests_share_one_forward_pass(self):
+        texts = [f'text-{i}' for i in range(10)]
+        
+        results = await self._embed_all(texts)
+        
+        self.assertEqual(len(self.batches), 1)
+        for text, vector in zip(texts, results):
+            np.testing.assert_array_equal(vector, fake_encode([text], 1)[0])
+    
+    async def test_each_caller_gets_its_own_vector_across_window_flushes(self):
+        texts = [f'text-{i}' for i in range(embeddings.MICRO_BATCH_MAX_SIZE * 2 + 5)]
+        
+        results = await self._embed_all(texts)
+        
+        self.assertGreater(len(self.batches), 2)
+        self.assertTrue(all(len(batch) <= embeddings.MICRO_BATCH_MAX_SIZE for batch in self.batches))
+        self.assertEqual(sorted(t for batch in self.batches for t in batch), sorted(texts))
+        for text, vector in zip(texts, results):
+            np.testing.assert_array_equal(vector, fake_encode([text], 1)[0])
+    
+    async def test_requests_after_the_window_go_in_a_new_batch(self):
+        try:
+            first = await self.batcher.embed('text-1')
+            await asyncio.sleep(embeddings.MICRO_BATCH_WINDOW_SECONDS * 4)
+            second = await self.batcher.embed('text-2')
+        finally:
+            await self._stop_worker()
+        
+        self.assertEqual(self.batches, [['text-1'], ['text-2']])
+        self.assertEqual((first[0], second[0]), (1.0, 2.0))
+    
+    async def test_encode_errors_reach_every_caller_in_the_batch(self):
+        self.encode.side_effect = RuntimeError('model failed')
+        
+        try:
+            results = await asyncio.gather(
+                self.batcher.embed('text-1'), self.batcher.embed('text-2'), return_exceptions=True
+            )
+        finally:
+            await self._stop_worker()
+        
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
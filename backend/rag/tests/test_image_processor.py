@@ -0,0 +1,46 @@
+"""
+Tests for the Vision phase of image processing.
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from rag.services.image_processor import ImageProcessor
+from rag.services.ocr_service import OCRResult
+from rag.services.vision_service import VisionService
+
+
+POOR_OCR = OCRResult('faint text', 20.0, 0.01, 0.01, True)
+
+
+class AddVisionTests(SimpleTestCase):
+    
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        patcher = mock.patch.object(VisionService, 'describe_image', mock.AsyncMock())
+        self.describe = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    async def test_description_is_cached(self):
+        self.describe.return_value = 'A bar chart'
+        
+        first = await ImageProcessor.add_vision(b'img', POOR_OCR, 'https://x/img.png')
+        second = await ImageProcessor.add_vision(b'img', POOR_OCR, 'https://x/img.png')
+        
+        self.assertEqual(first, 'A bar chart\n\nfaint text')
+        self.assertEqual(second, first)
+        self.describe.assert_awaited_once()
+    
+    async def test_empty_description_is_not_cached(self):
+        self.describe.return_value = ''
+        self.assertEqual(await ImageProcessor.add_vision(b'img', POOR_OCR, 'https://x/img.png'), 'faint text')
+        
+        self.describe.return_value = 'A bar chart'
+        self.assertEqual(
+            await ImageProcessor.add_vision(b'img', POOR_OCR, 'https://x/img.png'),
+            'A bar chart\n\nfaint text'
+        )
+        self.assertEqual(self.describe.await_count, 2)
@@ -0,0 +1,180 @@
+"""
+Tests for the upload ingestion pipeline in rag.views.
+"""
+
+import asyncio
+import time
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from rag import views
+from rag.models import Asset
+
+
+CLOUDINARY_URL = 'https://res.cloudinary.com/demo/raw/upload/notes.txt'
+CLOUDINARY_PUBLIC_ID = 'rag_documents/notes'
+
+
+class IngestTestCase(SimpleTestCase):
+    """Patches the services and ORM managers _ingest_upload talks to."""
+    
+    def setUp(self):
+        self.upload = self._patch(views.CloudinaryService, 'upload', mock.AsyncMock(
+            return_value=(CLOUDINARY_URL, CLOUDINARY_PUBLIC_ID)
+        ))
+        self.cloudinary_delete = self._patch(views.CloudinaryService, 'delete', mock.AsyncMock(return_value=True))
+        self._patch(views.DocumentProcessor, 'iter_pages', mock.Mock(return_value=iter(['page'])))
+        self._patch(views.TextChunker, 'chunk_pages', mock.Mock(return_value=['chunk a', 'chunk b']))
+        self.embed_and_store = self._patch(views, '_embed_and_store', mock.AsyncMock())
+        self.asset_objects = self._patch(Asset, 'objects', mock.Mock())
+        self.chunk_model = self._patch(views, 'DocumentChunk', mock.Mock())
+        self.user = mock.Mock(id=1)
+    
+    def _patch(self, target, attribute, new):
+        patcher = mock.patch.object(target, attribute, new)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+    
+    def pending_asset(self) -> Asset:
+        asset = Asset(id=uuid.uuid4(), status=Asset.STATUS_PROCESSING)
+        asset.save = mock.Mock()
+        return asset
+    
+    async def ingest_in_background(self, asset: Asset) -> None:
+        await views._ingest_in_background(self.user, 'notes.txt', False, b'hello', asset)
+
+
+class BackgroundIngestTests(IngestTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.connections = self._patch(views, 'connections', mock.Mock())
+    
+    async def test_processing_to_ready(self):
+        asset = self.pending_asset()
+        
+        await self.ingest_in_background(asset)
+        
+        self.assertEqual(asset.status, Asset.STATUS_READY)
+        self.assertEqual(asset.cloudinary_public_id, CLOUDINARY_PUBLIC_ID)
+        asset.save.assert_called_with(update_fields=['status'])
+        self.asset_objects.filter.return_value.update.assert_not_called()
+        self.cloudinary_delete.assert_not_called()
+        self.connections.close_all.assert_called_once_with()
+    
+    async def test_processing_to_failed(self):
+        asset = self.pending_asset()
+        self.embed_and_store.side_effect = RuntimeError('insert failed')
+        
+        with self.assertLogs('rag.views', 'ERROR'):
+            await self.ingest_in_background(asset)
+        
+        self.asset_objects.filter.assert_called_once_with(pk=asset.pk)
+        self.asset_objects.filter.return_value.update.assert_called_once_with(
+            status=Asset.STATUS_FAILED, cloudinary_url='', cloudinary_public_id=''
+        )
+        self.connections.close_all.assert_called_once_with()
+    
+    async def test_cancelled_marks_failed_and_propagates(self):
+        asset = self.pending_asset()
+        started = asyncio.Event()
+        
+        async def hang(*args, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+        
+        self.embed_and_store.side_effect = hang
+        task = asyncio.create_task(self.ingest_in_background(asset))
+        await started.wait()
+        task.cancel()
+        
+        with self.assertLogs('rag.views', 'WARNING'), self.assertRaises(asyncio.CancelledError):
+            await task
+        self.asset_objects.filter.return_value.update.assert_called_once_with(
+            status=Asset.STATUS_FAILED, cloudinary_url='', cloudinary_public_id=''
+        )
+        self.connections.close_all.assert_called_once_with()
+
+
+class IngestCleanupTests(IngestTestCase):
+    
+    async def ingest(self, asset=None) -> dict:
+        return await views._ingest_upload(self.user, 'notes.txt', False, b'hello', asset=asset)
+    
+    async def test_success_keeps_everything(self):
+        created = mock.Mock(id=uuid.uuid4(), status=Asset.STATUS_READY)
+        self.asset_objects.create.return_value = created
+        
+        result = await self.ingest()
+        
+        self.assertEqual(result['chunks_created'], 2)
+        self.cloudinary_delete.assert_not_called()
+        created.delete.assert_not_called()
+    
+    async def test_failed_ingest_deletes_new_asset_then_cloudinary_file(self):
+        calls = mock.Mock()
+        created = calls.asset
+        created.id = uuid.uuid4()
+        self.asset_objects.create.return_value = created
+        self.cloudinary_delete.side_effect = lambda public_id: calls.cloudinary_delete(public_id)
+        self.embed_and_store.side_effect = RuntimeError('insert failed')
+        
+        with self.assertRaises(RuntimeError):
+            await self.ingest()
+        
+        # Cleanups unwind in reverse order of registration
+        self.assertEqual(calls.mock_calls, [
+            mock.call.asset.delete(),
+            mock.call.cloudinary_delete(CLOUDINARY_PUBLIC_ID),
+        ])
+    
+    async def test_failed_ingest_of_pending_asset_deletes_its_chunks(self):
+        asset = self.pending_asset()
+        self.embed_and_store.side_effect = RuntimeError('insert failed')
+        
+        with self.assertRaises(RuntimeError):
+            await self.ingest(asset)
+        
+        document_id = self.chunk_model.objects.filter.call_args.kwargs['document_id']
+        self.assertIsInstance(document_id, uuid.UUID)
+        self.chunk_model.objects.filter.return_value.delete.assert_called_once_with()
+        self.cloudinary_delete.assert_awaited_once_with(CLOUDINARY_PUBLIC_ID)
+    
+    async def test_failed_extraction_deletes_cloudinary_file_only(self):
+        views.TextChunker.chunk_pages.side_effect = views.DocumentProcessorError('corrupt file')
+        
+        with self.assertRaises(views.DocumentProcessorError):
+            await self.ingest()
+        
+        self.asset_objects.create.assert_not_called()
+        self.cloudinary_delete.assert_awaited_once_with(CLOUDINARY_PUBLIC_ID)
+    
+    async def test_empty_extraction_deletes_cloudinary_file(self):
+        views.TextChunker.chunk_pages.return_value = []
+        
+        with self.assertRaisesMessage(views.DocumentProcessorError, 'No content'):
+            await self.ingest()
+        
+        self.cloudinary_delete.assert_awaited_once_with(CLOUDINARY_PUBLIC_ID)
+
+
+@override_settings(EMBEDDING_BATCH_SIZE=2, CHUNK_INSERT_BATCH_SIZE=2)
+class EmbedAndStoreTests(SimpleTestCase):
+    
+    async def test_in_flight_insert_settles_before_the_error_propagates(self):
+        inserted = []
+        
+        def slow_bulk_create(rows, batch_size):
+            time.sleep(0.05)
+            inserted.extend(rows)
+        
+        generate = mock.AsyncMock(side_effect=[[[0.1], [0.2]], RuntimeError('model failed')])
+        with mock.patch.object(views.EmbeddingsService, 'generate_embeddings', generate), \
+                mock.patch.object(views.DocumentChunk.objects, 'bulk_create', side_effect=slow_bulk_create):
+            with self.assertRaises(RuntimeError):
+                await views._embed_and_store(['a', 'b', 'c'], lambda text, embedding: text)
+        
+        # The first batch's INSERT finished, so the caller's cleanup can see it
+        self.assertEqual(inserted, ['a', 'b'])
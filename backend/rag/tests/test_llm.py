@@ -0,0 +1,64 @@
+"""
+Tests for streamed completion coalescing.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from rag.services import llm
+from rag.services.llm import LLMService
+
+
+def _chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+class StreamCompleteTests(SimpleTestCase):
+    
+    def _stream(self, script):
+        """Fake a completion stream from (delay_seconds, content) steps."""
+        async def stream():
+            for delay, content in script:
+                await asyncio.sleep(delay)
+                yield _chunk(content)
+        
+        client = mock.Mock()
+        client.chat.completions.create = mock.AsyncMock(return_value=stream())
+        patcher = mock.patch.object(LLMService, '_get_client', return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    async def _collect(self):
+        started = time.monotonic()
+        fragments = []
+        async for fragment in LLMService.stream_complete('system', 'question'):
+            fragments.append((fragment, time.monotonic() - started))
+        return fragments
+    
+    @mock.patch.object(llm, 'STREAM_FLUSH_SECONDS', 60.0)
+    async def test_fast_tokens_are_coalesced(self):
+        self._stream([(0, 'tok ')] * (llm.STREAM_FLUSH_TOKENS * 2 + 3))
+        
+        fragments = await self._collect()
+        
+        self.assertEqual([f for f, _ in fragments], ['tok ' * llm.STREAM_FLUSH_TOKENS] * 2 + ['tok ' * 3])
+    
+    async def test_buffered_tokens_flush_on_timer_while_model_stalls(self):
+        self._stream([(0, 'Hello'), (0, ','), (0.3, ' world')])
+        
+        fragments = await self._collect()
+        
+        self.assertEqual([f for f, _ in fragments], ['Hello,', ' world'])
+        # The first fragment went out on the flush timer, not with ' world'
+        self.assertLess(fragments[0][1], 0.2)
+    
+    async def test_empty_deltas_are_skipped(self):
+        self._stream([(0, None), (0, 'a'), (0, '')])
+        
+        fragments = await self._collect()
+        
+        self.assertEqual([f for f, _ in fragments], ['a'])
@@ -0,0 +1,122 @@
+"""
+Tests for running OCR in the process pool.
+"""
+
+import io
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from django.test import SimpleTestCase
+from PIL import Image
+import pytesseract
+
+from rag.services.ocr_service import OCRResult, OCRService
+
+
+RESULT = OCRResult('text', 90.0, 0.5, 0.5, False)
+
+
+def _without_tesseract():
+    """Pool initializer: point pytesseract at a binary that doesn't exist."""
+    pytesseract.pytesseract.tesseract_cmd = '/nonexistent/tesseract'
+
+
+class FakePool:
+    """Executor stand-in whose futures resolve to a fixed outcome."""
+    
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.submitted = 0
+        self.shut_down = False
+    
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        if isinstance(self.outcome, BaseException):
+            future.set_exception(self.outcome)
+        else:
+            future.set_result(self.outcome)
+        return future
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+class ExtractInPoolTests(SimpleTestCase):
+    
+    def setUp(self):
+        patcher = mock.patch.object(OCRService, '_pool', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    async def test_returns_worker_result(self):
+        OCRService._pool = pool = FakePool(RESULT)
+        self.assertEqual(await OCRService.extract_in_pool(b'img'), RESULT)
+        self.assertEqual(pool.submitted, 1)
+    
+    async def test_broken_pool_is_replaced_and_retried_once(self):
+        broken = FakePool(BrokenProcessPool('worker died'))
+        fresh = FakePool(RESULT)
+        OCRService._pool = broken
+        with mock.patch('rag.services.ocr_service.ProcessPoolExecutor', return_value=fresh), \
+                self.assertLogs('rag.services.ocr_service', 'WARNING'):
+            self.assertEqual(await OCRService.extract_in_pool(b'img'), RESULT)
+        self.assertTrue(broken.shut_down)
+        self.assertIs(OCRService._pool, fresh)
+        self.assertEqual((broken.submitted, fresh.submitted), (1, 1))
+    
+    async def test_second_failure_propagates(self):
+        OCRService._pool = FakePool(BrokenProcessPool('worker died'))
+        still_broken = FakePool(BrokenProcessPool('worker died again'))
+        with mock.patch('rag.services.ocr_service.ProcessPoolExecutor', return_value=still_broken), \
+                self.assertLogs('rag.services.ocr_service', 'WARNING'):
+            with self.assertRaises(BrokenProcessPool):
+                await OCRService.extract_in_pool(b'img')
+    
+    async def test_worker_error_reaches_caller_without_breaking_pool(self):
+        # TesseractNotFoundError can't be unpickled in the parent; the worker
+        # must hand back something that can instead of killing the pool
+        pool = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('forkserver'),
+            initializer=_without_tesseract
+        )
+        self.addCleanup(pool.shutdown)
+        OCRService._pool = pool
+        buffer = io.BytesIO()
+        Image.new('L', (400, 400), 255).save(buffer, format='PNG')
+        
+        with self.assertNoLogs('rag.services.ocr_service', 'WARNING'):
+            with self.assertRaisesRegex(RuntimeError, 'TesseractNotFoundError'):
+                await OCRService.extract_in_pool(buffer.getvalue())
+        self.assertIs(OCRService._pool, pool)
+    
+    def test_pool_uses_forkserver(self):
+        with mock.patch('rag.services.ocr_service.ProcessPoolExecutor') as executor:
+            OCRService.get_pool()
+        self.assertEqual(executor.call_args.kwargs['mp_context'].get_start_method(), 'forkserver')
+
+
+class ResizeIfNeededTests(SimpleTestCase):
+    
+    def _image(self, fmt: str, size: tuple[int, int]):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, (200, 30, 30)).save(buffer, format=fmt)
+        buffer.seek(0)
+        return Image.open(buffer)
+    
+    def test_large_jpeg_keeps_its_mode(self):
+        resized = OCRService._resize_if_needed(self._image('JPEG', (4000, 3000)))
+        self.assertEqual(resized.mode, 'RGB')
+        self.assertLessEqual(max(resized.size), OCRService.MAX_IMAGE_SIZE)
+    
+    def test_jpeg_and_png_give_the_same_mode_and_size(self):
+        jpeg = OCRService._resize_if_needed(self._image('JPEG', (4000, 3000)))
+        png = OCRService._resize_if_needed(self._image('PNG', (4000, 3000)))
+        self.assertEqual((jpeg.mode, jpeg.size), (png.mode, png.size))
+    
+    def test_small_image_is_untouched(self):
+        image = self._image('JPEG', (800, 600))
+        self.assertIs(OCRService._resize_if_needed(image), image)
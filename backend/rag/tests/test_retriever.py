@@ -0,0 +1,77 @@
+"""
+Tests for the pgvector similarity search.
+"""
+
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from rag.pipeline import retriever
+
+
+def _row(i: int) -> tuple:
+    return (i, f'chunk {i}', 'doc', 'pdf', None, 0.9, None, None)
+
+
+@override_settings(RAG_PREPARED_SEARCH=False)
+class ExecuteVectorSearchTests(SimpleTestCase):
+    
+    def setUp(self):
+        self.cursor = mock.MagicMock()
+        connection = mock.MagicMock()
+        connection.cursor.return_value.__enter__.return_value = self.cursor
+        for target, value in (('connection', connection), ('transaction', mock.MagicMock())):
+            patcher = mock.patch.object(retriever, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(retriever, '_iterative_scan_supported', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cursor.fetchone.return_value = ('0.7.4',)
+        self.embedding = np.zeros(384, dtype=np.float32)
+    
+    def _queries(self) -> list[str]:
+        return [call.args[0] for call in self.cursor.execute.call_args_list]
+    
+    def test_full_index_result_is_used_as_is(self):
+        self.cursor.fetchall.return_value = [_row(i) for i in range(3)]
+        
+        rows = retriever._execute_vector_search(self.embedding, 'u1', 3)
+        
+        self.assertEqual(len(rows), 3)
+        self.assertNotIn(retriever._EXACT_SEARCH_QUERY, self._queries())
+    
+    def test_short_index_result_falls_back_to_exact_scan(self):
+        exact_rows = [_row(i) for i in range(3)]
+        self.cursor.fetchall.side_effect = [[_row(0)], exact_rows]
+        
+        rows = retriever._execute_vector_search(self.embedding, 'u1', 3)
+        
+        self.assertEqual(rows, exact_rows)
+        self.assertEqual(self._queries()[-2:], [
+            retriever._VECTOR_SEARCH_QUERY, retriever._EXACT_SEARCH_QUERY
+        ])
+    
+    def test_iterative_scan_replaces_the_exact_fallback(self):
+        self.cursor.fetchone.return_value = ('0.8.0',)
+        self.cursor.fetchall.return_value = [_row(0)]
+        
+        rows = retriever._execute_vector_search(self.embedding, 'u1', 3)
+        
+        self.assertEqual(len(rows), 1)
+        self.assertIn(retriever._SET_ITERATIVE_SEARCH_PARAMS, self._queries())
+        self.assertNotIn(retriever._EXACT_SEARCH_QUERY, self._queries())
+    
+    def test_extension_version_is_looked_up_once(self):
+        self.cursor.fetchall.return_value = [_row(i) for i in range(3)]
+        
+        retriever._execute_vector_search(self.embedding, 'u1', 3)
+        retriever._execute_vector_search(self.embedding, 'u1', 3)
+        
+        self.assertEqual(self.cursor.fetchone.call_count, 1)
+        self.assertEqual(self._queries().count(retriever._SET_SEARCH_PARAMS), 2)
+    
+    def test_exact_query_ranks_by_similarity(self):
+        self.assertIn('ORDER BY similarity DESC', retriever._EXACT_SEARCH_QUERY)
+        self.assertIn('ORDER BY c.embedding <=> q.e', retriever._VECTOR_SEARCH_QUERY)
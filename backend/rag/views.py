@@ -4,13 +4,21 @@ RAG API Views with JWT Authentication, Cloudinary, and Asset management.
 ALL blocking operations wrapped with sync_to_async to prevent event loop blocking.
 """
 
+import asyncio
 import uuid
+from contextlib import AsyncExitStack
+from io import BytesIO
+import orjson
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.permissions import IsAuthenticated
 from adrf.views import APIView
-from asgiref.sync import sync_to_async
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.http import StreamingHttpResponse
 
 from rag.models import DocumentChunk, Asset, ChatSession, ChatMessage
 from rag.serializers import (
@@ -18,7 +26,6 @@ from rag.serializers import (
     DocumentUploadResponseSerializer,
     ChatRequestSerializer,
     ChatResponseSerializer,
-    AssetListResponseSerializer,
     AssetSerializer,
 )
 from rag.services.document_processor import DocumentProcessor, DocumentProcessorError
@@ -31,6 +38,370 @@ from rag.pipeline.retriever import Retriever
 from rag.pipeline.generator import Generator
 
 
+async def _classify_and_retrieve(message: str, user_id: str):
+    """
+    Classify the query and retrieve context, overlapping the two.
+    
+    The query embedding is computed while the classifier LLM call is in
+    flight and discarded if the query turns out to be GENERAL.
+    
+    Returns:
+        Tuple of (query_type, chunks or None)
+    """
+    classify_task = asyncio.create_task(QueryClassifier.classify(message))
+    embed_task = asyncio.create_task(EmbeddingsService.generate_embedding(message))
+    
+    try:
+        query_type = await classify_task
+    except BaseException:
+        embed_task.cancel()
+        raise
+    
+    if not QueryClassifier.needs_retrieval(query_type):
+        embed_task.cancel()
+        return query_type, None
+    
+    query_embedding = await embed_task
+    chunks = await Retriever.retrieve_with_embedding(query_embedding, user_id)
+    return query_type, chunks
+
+
+def _load_session_and_save_user(user, session_id, message: str):
+    """
+    Get or create the chat session and save the user's message.
+    
+    Runs both statements in one thread hop and one transaction.
+    
+    Returns:
+        The session, or None if session_id doesn't belong to the user
+        (nothing is written in that case)
+    """
+    with transaction.atomic():
+        if session_id:
+            session = ChatSession.objects.filter(id=session_id, user=user).first()
+            if not session:
+                return None
+        else:
+            session = ChatSession.objects.create(user=user)
+        
+        ChatMessage.objects.create(
+            session=session,
+            role='user',
+            content=message,
+            used_context=False  # User messages don't use context
+        )
+    return session
+
+
+# Server-sent event framing, pre-encoded so frames are built from bytes only
+_SSE_PREFIX = b'data: '
+_SSE_SUFFIX = b'\n\n'
+
+
+# The session frame only varies by a UUID (no characters to escape), so it
+# is spliced into a fixed template instead of serialized per request
+_SSE_SESSION_PREFIX = b'data: {"type":"session","session_id":"'
+_SSE_SESSION_SUFFIX = b'"}\n\n'
+
+# Streaming headers: no caching and no proxy buffering. No GZipMiddleware is
+# installed, so frames reach the client uncompressed
+_SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no',
+}
+
+
+def _sse(event: dict) -> bytes:
+    """Encode one event as an SSE data frame."""
+    return _SSE_PREFIX + orjson.dumps(event) + _SSE_SUFFIX
+
+
+def _sse_session(session_id) -> bytes:
+    """Encode the session event as an SSE data frame."""
+    return _SSE_SESSION_PREFIX + str(session_id).encode() + _SSE_SESSION_SUFFIX
+
+
+def _validate(serializer_cls, data):
+    """
+    Validate request data.
+    
+    The request serializers have no DB-backed validators, so this is
+    plain CPU work and is called inline rather than through a thread hop.
+    
+    Returns:
+        Tuple of (is_valid, validated_data or None, errors or None)
+    """
+    serializer = serializer_cls(data=data)
+    if serializer.is_valid():
+        return True, serializer.validated_data, None
+    return False, None, serializer.errors
+
+
+async def _embed_and_store(chunks: list[str], build_chunk) -> None:
+    """
+    Embed chunks and insert them as DocumentChunk rows, pipelined by batch.
+    
+    Batch N is inserted (in the sync DB thread) while batch N+1 is being
+    embedded (in the model worker thread), so neither waits on the other.
+    
+    Args:
+        chunks: Chunk texts, stored in order
+        build_chunk: Callable (chunk_text, embedding) -> unsaved DocumentChunk
+    """
+    batch_size = settings.EMBEDDING_BATCH_SIZE
+    
+    def insert(batch, embeddings):
+        DocumentChunk.objects.bulk_create(
+            [build_chunk(text, embedding) for text, embedding in zip(batch, embeddings)],
+            batch_size=settings.CHUNK_INSERT_BATCH_SIZE
+        )
+    
+    pending_insert = None
+    try:
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            embeddings = await EmbeddingsService.generate_embeddings(batch, batch_size=batch_size)
+            
+            # At most one INSERT in flight; wait for it before queueing the next
+            if pending_insert is not None:
+                await pending_insert
+            pending_insert = asyncio.create_task(sync_to_async(insert)(batch, embeddings))
+        
+        if pending_insert is not None:
+            await pending_insert
+    except BaseException:
+        # The INSERT runs in a thread and can't be interrupted; let it settle
+        # so the caller's cleanup sees (and removes) every row it wrote
+        if pending_insert is not None:
+            await asyncio.gather(pending_insert, return_exceptions=True)
+        raise
+
+
+async def _upload_independent_copy(uploaded_file, filename: str):
+    """
+    Upload a Django uploaded file to Cloudinary through a separate reader.
+    
+    Lets the upload run while another consumer reads uploaded_file.file:
+    large uploads are reopened from their temp file, small in-memory ones
+    are copied (they are at most FILE_UPLOAD_MAX_MEMORY_SIZE).
+    """
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        stream = await sync_to_async(open)(uploaded_file.temporary_file_path(), 'rb')
+    else:
+        stream = BytesIO(uploaded_file.file.getvalue())
+    
+    try:
+        return await CloudinaryService.upload(stream, filename)
+    finally:
+        stream.close()
+
+
+def _asset_type(filename: str, is_image: bool) -> str:
+    """Map an upload to its Asset.asset_type."""
+    if is_image:
+        return 'image'
+    return 'pdf' if DocumentProcessor.get_file_extension(filename) == 'pdf' else 'docx'
+
+
+async def _ingest_upload(user, filename: str, is_image: bool, file_content, uploaded_file=None, asset=None) -> dict:
+    """
+    Run the upload pipeline: Cloudinary upload overlapped with text
+    extraction, then chunk, embed and store.
+    
+    Args:
+        user: Owner of the upload
+        filename: Original filename
+        is_image: Whether the file goes through OCR/Vision
+        file_content: Image bytes, document bytes, or the uploaded file stream
+        uploaded_file: Django uploaded file when file_content is its stream
+            (gives the Cloudinary upload its own reader)
+        asset: Pending Asset to complete; a new one is created if None
+        
+    Returns:
+        Upload response data
+        
+    Raises:
+        DocumentProcessorError: If extraction fails or yields no content
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    # Upload to Cloudinary while extracting text: the upload is network
+    # bound and extraction (OCR / PDF parsing) is CPU bound
+    logger.info(f"[Upload] Uploading to Cloudinary and extracting text...")
+    if is_image:
+        upload = CloudinaryService.upload(file_content, filename)
+        extract = ImageProcessor.run_ocr(file_content)
+    else:
+        if uploaded_file is not None:
+            # Extraction reads the upload file in a worker thread, so the
+            # upload gets its own reader over the same data
+            upload = _upload_independent_copy(uploaded_file, filename)
+        else:
+            upload = CloudinaryService.upload(file_content, filename)
+        extract = sync_to_async(
+            lambda: TextChunker.chunk_pages(
+                DocumentProcessor.iter_pages(file_content, filename)
+            )
+        )()
+    upload_result, extract_result = await asyncio.gather(
+        upload, extract, return_exceptions=True
+    )
+    
+    if isinstance(upload_result, BaseException):
+        raise upload_result
+    cloudinary_url, cloudinary_public_id = upload_result
+    logger.info(f"[Upload] Cloudinary complete: {cloudinary_url[:50]}...")
+    
+    # Each resource registers its own cleanup as soon as it exists; on any
+    # failure they are undone in reverse order, on success pop_all() keeps them
+    async with AsyncExitStack() as cleanup:
+        cleanup.push_async_callback(CloudinaryService.delete, cloudinary_public_id)
+        
+        if isinstance(extract_result, BaseException):
+            raise extract_result
+        
+        # Finish extraction: different logic for images vs documents
+        if is_image:
+            # Vision fallback needs the Cloudinary URL, so it runs after the upload
+            text = await ImageProcessor.add_vision(file_content, extract_result, cloudinary_url)
+            doc_type = 'image'
+            logger.info(f"[Upload] Image processing complete: {len(text)} chars")
+            
+            # Chunk the text (pure Python, but wrap for safety)
+            chunks = await sync_to_async(TextChunker.chunk_text)(text)
+        else:
+            doc_type = DocumentProcessor.get_file_extension(filename)
+            chunks = extract_result
+        
+        if not chunks:
+            raise DocumentProcessorError('No content could be extracted from the file')
+        
+        # Create document ID for grouping chunks
+        document_id = uuid.uuid4()
+        source = 'image' if is_image else 'user_upload'
+        
+        # Create (or fill in) the Asset record (DB operation)
+        if asset is None:
+            logger.info("[Upload] Creating Asset record...")
+            asset = await sync_to_async(Asset.objects.create)(
+                user=user,
+                asset_type=_asset_type(filename, is_image),
+                cloudinary_url=cloudinary_url,
+                cloudinary_public_id=cloudinary_public_id,
+                original_filename=filename
+            )
+            logger.info(f"[Upload] Asset created: {asset.id}")
+            # Deleting the asset also cascades to any chunks already inserted
+            cleanup.push_async_callback(sync_to_async(asset.delete))
+        else:
+            asset.cloudinary_url = cloudinary_url
+            asset.cloudinary_public_id = cloudinary_public_id
+            await sync_to_async(asset.save)(
+                update_fields=['cloudinary_url', 'cloudinary_public_id']
+            )
+            # The pending asset is kept (and marked failed by the caller), but
+            # chunks from a partial insert must not show up in retrieval
+            cleanup.push_async_callback(
+                sync_to_async(DocumentChunk.objects.filter(document_id=document_id).delete)
+            )
+        
+        # Embed and store chunks with asset reference, overlapping the
+        # INSERT of each batch with embedding of the next
+        await _embed_and_store(
+            chunks,
+            lambda chunk_text, embedding: DocumentChunk(
+                user_id=str(user.id),
+                asset=asset,
+                document_id=document_id,
+                doc_type=doc_type,
+                source=source,
+                content=chunk_text,
+                embedding=embedding
+            )
+        )
+        
+        if asset.status != Asset.STATUS_READY:
+            asset.status = Asset.STATUS_READY
+            await sync_to_async(asset.save)(update_fields=['status'])
+        
+        cleanup.pop_all()
+    
+    return {
+        'asset_id': asset.id,
+        'document_id': document_id,
+        'chunks_created': len(chunks),
+        'doc_type': doc_type,
+        'cloudinary_url': cloudinary_url,
+        'message': f'Successfully processed document with {len(chunks)} chunks'
+    }
+
+
+# Strong references to in-flight background tasks (the event loop only
+# keeps weak ones)
+_background_tasks: set[asyncio.Task] = set()
+
+# Retry schedule for background Cloudinary deletes: 1s, 2s, 4s, 8s
+CLOUDINARY_DELETE_ATTEMPTS = 5
+CLOUDINARY_DELETE_BASE_DELAY = 1.0
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Run a coroutine after the response, keeping the task referenced until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _cloudinary_delete_with_retry(public_id: str) -> None:
+    """Delete a Cloudinary file with exponential backoff, logging if it is left orphaned."""
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    for attempt in range(CLOUDINARY_DELETE_ATTEMPTS):
+        if await CloudinaryService.delete(public_id):
+            return
+        if attempt < CLOUDINARY_DELETE_ATTEMPTS - 1:
+            await asyncio.sleep(CLOUDINARY_DELETE_BASE_DELAY * 2 ** attempt)
+    
+    logger.error(f"[Delete] Giving up on Cloudinary delete, orphaned file: {public_id}")
+
+
+async def _ingest_in_background(user, filename: str, is_image: bool, file_content: bytes, asset) -> None:
+    """
+    Run _ingest_upload for a pending asset, marking it failed on error.
+    
+    Cancellation (worker shutdown or reload) also marks it failed before
+    propagating, so the asset never stays processing forever.
+    
+    The task outlives its request, so it gets its own sync thread and
+    closes that thread's DB connections itself; Django's request_finished
+    cleanup has already run by then.
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    # The pipeline deletes the Cloudinary file on failure, so drop the link too
+    mark_failed = sync_to_async(
+        lambda: Asset.objects.filter(pk=asset.pk).update(
+            status=Asset.STATUS_FAILED, cloudinary_url='', cloudinary_public_id=''
+        )
+    )
+    async with ThreadSensitiveContext():
+        try:
+            await _ingest_upload(user, filename, is_image, file_content, asset=asset)
+        except asyncio.CancelledError:
+            logger.warning(f"[Upload] Background processing cancelled for asset {asset.id}")
+            await mark_failed()
+            raise
+        except Exception:
+            logger.exception(f"[Upload] Background processing failed for asset {asset.id}")
+            await mark_failed()
+        finally:
+            await sync_to_async(connections.close_all)()
+
+
 class DocumentUploadView(APIView):
     """
     Upload and process a document for RAG with Cloudinary storage.
@@ -40,6 +411,9 @@ class DocumentUploadView(APIView):
     
     Form data:
         - file: PDF or DOCX file
+    
+    With RAG_BACKGROUND_UPLOADS enabled, responds 202 with a processing
+    asset as soon as the file is received; poll GET /api/assets for status.
     """
     permission_classes = [IsAuthenticated]
     
@@ -47,17 +421,16 @@ class DocumentUploadView(APIView):
         user = request.user
         
         # Validate request
-        serializer = DocumentUploadSerializer(data=request.data)
-        is_valid = await sync_to_async(serializer.is_valid)()
+        is_valid, validated_data, errors = _validate(
+            DocumentUploadSerializer, request.data
+        )
         
         if not is_valid:
-            errors = await sync_to_async(lambda: serializer.errors)()
             return Response(
                 {'error': 'Invalid request', 'detail': errors},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        validated_data = await sync_to_async(lambda: serializer.validated_data)()
         uploaded_file = validated_data['file']
         filename = uploaded_file.name
         
@@ -71,121 +444,64 @@ class DocumentUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        if settings.RAG_BACKGROUND_UPLOADS:
+            return await self._accept_in_background(user, uploaded_file, filename, is_image)
+        
         try:
             import logging
             logger = logging.getLogger(__name__)
             
-            # Read file content (I/O operation)
-            logger.info(f"[Upload] Reading file: {filename}")
-            file_content = await sync_to_async(uploaded_file.read)()
-            logger.info(f"[Upload] File read complete: {len(file_content)} bytes")
-            
-            # Upload to Cloudinary (network I/O - MUST be async)
-            logger.info(f"[Upload] Uploading to Cloudinary...")
-            cloudinary_url, cloudinary_public_id = await sync_to_async(
-                CloudinaryService.upload
-            )(file_content, filename)
-            logger.info(f"[Upload] Cloudinary complete: {cloudinary_url[:50]}...")
-            
-            
-            # Determine asset type
-            ext = filename.rsplit('.', 1)[-1].lower()
+            # Images are read into memory (OCR ships bytes to the process pool);
+            # documents stay in Django's upload file, spooled to disk when large
             if is_image:
-                asset_type = 'image'
-            elif ext == 'pdf':
-                asset_type = 'pdf'
+                logger.info(f"[Upload] Reading file: {filename}")
+                file_content = await sync_to_async(uploaded_file.read)()
+                logger.info(f"[Upload] File read complete: {len(file_content)} bytes")
+                response_data = await _ingest_upload(user, filename, is_image, file_content)
             else:
-                asset_type = 'docx'
-            
-            # Create Asset record (DB operation)
-            logger.info("[Upload] Creating Asset record...")
-            asset = await sync_to_async(Asset.objects.create)(
-                user=user,
-                asset_type=asset_type,
-                cloudinary_url=cloudinary_url,
-                cloudinary_public_id=cloudinary_public_id,
-                original_filename=filename
-            )
-            logger.info(f"[Upload] Asset created: {asset.id}")
-            
-            # Extract text: different logic for images vs documents
-            if is_image:
-                # Use ImageProcessor (OCR + conditional Vision)
-                logger.info("[Upload] Starting image processing (OCR + Vision)...")
-                text = await ImageProcessor.process_image(file_content, cloudinary_url)
-                doc_type = 'image'
-                logger.info(f"[Upload] Image processing complete: {len(text)} chars")
-            else:
-                # Use DocumentProcessor for PDF/DOCX
-                text, doc_type = await sync_to_async(
-                    DocumentProcessor.extract_text
-                )(file_content, filename)
-            
-            # Chunk the text (pure Python, but wrap for safety)
-            chunks = await sync_to_async(TextChunker.chunk_text)(text)
-            
-            if not chunks:
-                # Delete asset if no content extracted
-                await sync_to_async(asset.delete)()
-                return Response(
-                    {'error': 'No content could be extracted from the file'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Generate embeddings for all chunks (already async)
-            embeddings = await EmbeddingsService.generate_embeddings(chunks)
-            
-            # Create document ID for grouping chunks
-            document_id = uuid.uuid4()
-            
-            # Store chunks in database with asset reference
-            chunk_objects = [
-                DocumentChunk(
-                    user_id=str(user.id),
-                    asset=asset,
-                    document_id=document_id,
-                    doc_type=doc_type,
-                    source='image' if is_image else 'user_upload',
-                    content=chunk_text,
-                    embedding=embedding
+                logger.info(f"[Upload] Using uploaded file: {uploaded_file.size} bytes")
+                response_data = await _ingest_upload(
+                    user, filename, is_image, uploaded_file.file, uploaded_file=uploaded_file
                 )
-                for chunk_text, embedding in zip(chunks, embeddings)
-            ]
-            
-            # Bulk create for efficiency (DB operation)
-            await sync_to_async(DocumentChunk.objects.bulk_create)(chunk_objects)
             
-            response_data = {
-                'asset_id': asset.id,
-                'document_id': document_id,
-                'chunks_created': len(chunks),
-                'doc_type': doc_type,
-                'cloudinary_url': cloudinary_url,
-                'message': f'Successfully processed document with {len(chunks)} chunks'
-            }
-            
-            serialized = await sync_to_async(
-                lambda: DocumentUploadResponseSerializer(response_data).data
-            )()
-            
-            return Response(serialized, status=status.HTTP_201_CREATED)
+            # Plain dict in, plain dict out: no DB access, so no thread hop
+            return Response(
+                DocumentUploadResponseSerializer(response_data).data,
+                status=status.HTTP_201_CREATED
+            )
             
         except DocumentProcessorError as e:
-            # Clean up cloudinary if processing failed
-            if 'cloudinary_public_id' in locals():
-                await sync_to_async(CloudinaryService.delete)(cloudinary_public_id)
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            # Clean up on any error
-            if 'cloudinary_public_id' in locals():
-                await sync_to_async(CloudinaryService.delete)(cloudinary_public_id)
             return Response(
                 {'error': 'Failed to process document', 'detail': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    async def _accept_in_background(self, user, uploaded_file, filename: str, is_image: bool) -> Response:
+        """
+        Record a processing asset and run the pipeline after responding.
+        
+        The upload is read into memory because Django removes its temp
+        file once the request finishes.
+        """
+        file_content = await sync_to_async(uploaded_file.read)()
+        asset = await sync_to_async(Asset.objects.create)(
+            user=user,
+            asset_type=_asset_type(filename, is_image),
+            original_filename=filename,
+            status=Asset.STATUS_PROCESSING
+        )
+        
+        _spawn(_ingest_in_background(user, filename, is_image, file_content, asset))
+        
+        return Response(
+            {'asset_id': asset.id, 'status': asset.status},
+            status=status.HTTP_202_ACCEPTED
+        )
 
 
 class AssetListView(APIView):
@@ -200,20 +516,16 @@ class AssetListView(APIView):
     async def get(self, request: Request) -> Response:
         user = request.user
         
-        # Get all assets for this user (DB operation)
+        # Get all assets for this user as plain dicts (DB operation); the rows
+        # are already in response shape, so no model instances or serializer
+        # pass are needed (DRF's JSON encoder handles UUIDs and datetimes)
         assets = await sync_to_async(list)(
-            Asset.objects.filter(user=user).order_by('-created_at')
+            Asset.objects.filter(user=user).order_by('-created_at').values(
+                *AssetSerializer.Meta.fields
+            )
         )
         
-        # Serialize (can be expensive with many assets)
-        serialized = await sync_to_async(
-            lambda: AssetListResponseSerializer({
-                'assets': assets,
-                'total': len(assets)
-            }).data
-        )()
-        
-        return Response(serialized, status=status.HTTP_200_OK)
+        return Response({'assets': assets, 'total': len(assets)}, status=status.HTTP_200_OK)
 
 
 class AssetDeleteView(APIView):
@@ -240,20 +552,14 @@ class AssetDeleteView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Delete from Cloudinary (network I/O)
-            cloudinary_deleted = await sync_to_async(
-                CloudinaryService.delete
-            )(asset.cloudinary_public_id)
-            
-            if not cloudinary_deleted:
-                return Response(
-                    {'error': 'Failed to delete file from Cloudinary'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
             # Delete asset (cascades to chunks automatically) - DB operation
             await sync_to_async(asset.delete)()
             
+            # Remove the Cloudinary file after responding (retried in the
+            # background); assets still processing have no file yet
+            if asset.cloudinary_public_id:
+                _spawn(_cloudinary_delete_with_retry(asset.cloudinary_public_id))
+            
             return Response(
                 {'message': 'Asset and all related data deleted successfully'},
                 status=status.HTTP_200_OK
@@ -284,54 +590,42 @@ class ChatView(APIView):
         user_id = str(user.id)
         
         # Validate request
-        serializer = ChatRequestSerializer(data=request.data)
-        is_valid = await sync_to_async(serializer.is_valid)()
+        is_valid, validated_data, errors = _validate(
+            ChatRequestSerializer, request.data
+        )
         
         if not is_valid:
-            errors = await sync_to_async(lambda: serializer.errors)()
             return Response(
                 {'error': 'Invalid request', 'detail': errors},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        validated_data = await sync_to_async(lambda: serializer.validated_data)()
         message = validated_data['message']
         session_id = validated_data.get('session_id')
         
         try:
-            # Get or create chat session
-            if session_id:
-                session = await sync_to_async(
-                    lambda: ChatSession.objects.filter(id=session_id, user=user).first()
-                )()
-                if not session:
-                    return Response(
-                        {'error': 'Session not found or access denied'},
-                        status=status.HTTP_404_NOT_FOUND
-                    )
-            else:
-                # Create new session
-                session = await sync_to_async(ChatSession.objects.create)(user=user)
-            
-            # Save user message
-            user_message = await sync_to_async(ChatMessage.objects.create)(
-                session=session,
-                role='user',
-                content=message,
-                used_context=False  # User messages don't use context
-            )
+            # Get or create the session and save the user message (one thread
+            # hop) while classifying the query and retrieving context if
+            # needed (classifier LLM call overlaps with query embedding)
+            classify_task = asyncio.create_task(_classify_and_retrieve(message, user_id))
+            try:
+                session = await sync_to_async(_load_session_and_save_user)(
+                    user, session_id, message
+                )
+            except BaseException:
+                classify_task.cancel()
+                raise
             
-            # Step 1: Classify the query (already async - uses LLM)
-            query_type = await QueryClassifier.classify(message)
+            if not session:
+                classify_task.cancel()
+                return Response(
+                    {'error': 'Session not found or access denied'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
             
-            # Step 2: Retrieve context if needed (already async)
-            chunks = None
-            used_context = False
-            if QueryClassifier.needs_retrieval(query_type):
-                chunks = await Retriever.retrieve(query=message, user_id=user_id)
-                used_context = len(chunks) > 0 if chunks else False
+            query_type, chunks = await classify_task
             
-            # Step 3: Generate answer (already async - uses LLM)
+            # Generate answer (already async - uses LLM)
             result = await Generator.generate(question=message, chunks=chunks)
             
             # Save assistant message
@@ -351,15 +645,19 @@ class ChatView(APIView):
             # Add sources if available (Phase 6 - Context Surfacing)
             if result.sources:
                 response_data['sources'] = [
-                    {'asset_id': source.asset_id, 'excerpt': source.excerpt}
+                    {
+                        'asset_id': source.asset_id,
+                        'excerpt': source.excerpt,
+                        'asset_filename': source.asset_filename,
+                        'asset_url': source.asset_url,
+                    }
                     for source in result.sources
                 ]
             
-            serialized = await sync_to_async(
-                lambda: ChatResponseSerializer(response_data).data
-            )()
-            
-            return Response(serialized, status=status.HTTP_200_OK)
+            return Response(
+                ChatResponseSerializer(response_data).data,
+                status=status.HTTP_200_OK
+            )
             
         except Exception as e:
             return Response(
@@ -380,17 +678,27 @@ class ChatSessionListView(APIView):
     async def get(self, request: Request) -> Response:
         user = request.user
         
-        # Get all sessions for user
-        sessions = await sync_to_async(list)(
-            ChatSession.objects.filter(user=user).prefetch_related('messages')
-        )
+        # Get all sessions for user, most recently active first, loading only
+        # the columns the list shows; message count and last message are
+        # annotated so serialization issues no per-session queries
+        last_message = ChatMessage.objects.filter(
+            session=OuterRef('pk')
+        ).order_by('-created_at').values('content')[:1]
+        sessions = ChatSession.objects.filter(user=user).only(
+            'id', 'created_at', 'updated_at'
+        ).annotate(
+            message_count=Count('messages'),
+            last_message_at=Max('messages__created_at'),
+            _last_message_content=Subquery(last_message),
+        ).order_by(F('last_message_at').desc(nulls_last=True), '-created_at')
         
-        from rag.serializers import ChatSessionSerializer
+        # Fetch and serialize in one thread hop
+        from rag.serializers import ChatSessionListSerializer
         serialized = await sync_to_async(
-            lambda: [ChatSessionSerializer(s).data for s in sessions]
+            lambda: ChatSessionListSerializer(sessions, many=True).data
         )()
         
-        return Response({'sessions': serialized, 'total': len(sessions)}, status=status.HTTP_200_OK)
+        return Response({'sessions': serialized, 'total': len(serialized)}, status=status.HTTP_200_OK)
 
 
 class ChatSessionDetailView(APIView):
@@ -418,12 +726,9 @@ class ChatSessionDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        # Messages are already prefetched, so serializing needs no DB access
         from rag.serializers import ChatSessionDetailSerializer
-        serialized = await sync_to_async(
-            lambda: ChatSessionDetailSerializer(session).data
-        )()
-        
-        return Response(serialized, status=status.HTTP_200_OK)
+        return Response(ChatSessionDetailSerializer(session).data, status=status.HTTP_200_OK)
 
 
 class ChatStreamView(APIView):
@@ -452,47 +757,30 @@ class ChatStreamView(APIView):
     content_negotiation_class = IgnoreClientContentNegotiation
     
     async def post(self, request: Request):
-        import json
-        from django.http import StreamingHttpResponse
-        
         user = request.user
         user_id = str(user.id)
         
         # Validate request
-        serializer = ChatRequestSerializer(data=request.data)
-        is_valid = await sync_to_async(serializer.is_valid)()
+        is_valid, validated_data, errors = _validate(
+            ChatRequestSerializer, request.data
+        )
         
         if not is_valid:
-            errors = await sync_to_async(lambda: serializer.errors)()
             return Response(
                 {'error': 'Invalid request', 'detail': errors},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        validated_data = await sync_to_async(lambda: serializer.validated_data)()
         message = validated_data['message']
         session_id = validated_data.get('session_id')
         
-        # Get or create session
-        if session_id:
-            session = await sync_to_async(
-                lambda: ChatSession.objects.filter(id=session_id, user=user).first()
-            )()
-            if not session:
-                return Response(
-                    {'error': 'Session not found'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-        else:
-            session = await sync_to_async(ChatSession.objects.create)(user=user)
-        
-        # Save user message
-        await sync_to_async(ChatMessage.objects.create)(
-            session=session,
-            role='user',
-            content=message,
-            used_context=False
-        )
+        # Get or create session and save user message (one thread hop)
+        session = await sync_to_async(_load_session_and_save_user)(user, session_id, message)
+        if not session:
+            return Response(
+                {'error': 'Session not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
         async def event_stream():
             full_response = ""
@@ -500,27 +788,23 @@ class ChatStreamView(APIView):
             sources = None
             
             try:
-                # Classify query
-                query_type = await QueryClassifier.classify(message)
-                
-                # Retrieve context if needed
-                chunks = None
-                if QueryClassifier.needs_retrieval(query_type):
-                    chunks = await Retriever.retrieve(query=message, user_id=user_id)
+                # Classify query and retrieve context if needed
+                query_type, chunks = await _classify_and_retrieve(message, user_id)
                 
                 # Send session info first
-                yield f"data: {json.dumps({'type': 'session', 'session_id': str(session.id)})}\n\n"
+                yield _sse_session(session.id)
                 
                 # Stream tokens
                 async for event in Generator.stream_generate(question=message, chunks=chunks):
                     if event['type'] == 'token':
                         full_response += event['content']
-                        yield f"data: {json.dumps(event)}\n\n"
+                        yield _sse(event)
                     elif event['type'] == 'done':
                         used_context = event.get('used_context', False)
                         sources = event.get('sources')
                 
-                # Save assistant message
+                # Save assistant message before reporting completion, so a
+                # failed save arrives as an error event rather than after done
                 await sync_to_async(ChatMessage.objects.create)(
                     session=session,
                     role='assistant',
@@ -529,15 +813,13 @@ class ChatStreamView(APIView):
                 )
                 
                 # Send final event with metadata
-                yield f"data: {json.dumps({'type': 'done', 'used_context': used_context, 'sources': sources})}\n\n"
+                yield _sse({'type': 'done', 'used_context': used_context, 'sources': sources})
                 
             except Exception as e:
-                yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+                yield _sse({'type': 'error', 'message': str(e)})
         
-        response = StreamingHttpResponse(
+        return StreamingHttpResponse(
             event_stream(),
-            content_type='text/event-stream'
+            content_type='text/event-stream',
+            headers=_SSE_HEADERS
         )
-        response['Cache-Control'] = 'no-cache'
-        response['X-Accel-Buffering'] = 'no'
-        return response
@@ -50,8 +50,14 @@ export const MessageBubble: React.FC<MessageBubbleProps> = ({ message }) => {
                         <div className="grid gap-2 sm:grid-cols-2">
                             {message.sources.map((source, idx) => (
                                 <div key={idx} className="rounded border border-zinc-800 bg-zinc-900 p-2 text-xs text-zinc-400">
-                                    <div className="mb-1 font-medium text-blue-400 truncate" title={source.asset_id}>
-                                        Document Reference
+                                    <div className="mb-1 font-medium text-blue-400 truncate" title={source.asset_filename || source.asset_id}>
+                                        {source.asset_url ? (
+                                            <a href={source.asset_url} target="_blank" rel="noreferrer" className="hover:underline">
+                                                {source.asset_filename || 'Document Reference'}
+                                            </a>
+                                        ) : (
+                                            source.asset_filename || 'Document Reference'
+                                        )}
                                     </div>
                                     <p className="line-clamp-2 italic opacity-80">"{source.excerpt}"</p>
                                 </div>
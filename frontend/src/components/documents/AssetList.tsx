@@ -56,14 +56,20 @@ export const AssetList: React.FC<AssetListProps> = ({ assets, onDelete }) => {
                         <span className="text-xs font-semibold uppercase tracking-wider text-zinc-500">
                             {asset.asset_type.toUpperCase()}
                         </span>
-                        <a
-                            href={asset.cloudinary_url}
-                            target="_blank"
-                            rel="noreferrer"
-                            className="text-xs text-blue-500 hover:text-blue-400"
-                        >
-                            View Original
-                        </a>
+                        {asset.status === 'ready' ? (
+                            <a
+                                href={asset.cloudinary_url}
+                                target="_blank"
+                                rel="noreferrer"
+                                className="text-xs text-blue-500 hover:text-blue-400"
+                            >
+                                View Original
+                            </a>
+                        ) : (
+                            <span className={asset.status === 'failed' ? 'text-xs text-red-500' : 'text-xs text-zinc-500'}>
+                                {asset.status === 'failed' ? 'Processing failed' : 'Processing...'}
+                            </span>
+                        )}
                     </div>
                 </div>
             ))}
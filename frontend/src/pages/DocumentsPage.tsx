@@ -5,6 +5,9 @@ import { AssetList } from '../components/documents/AssetList';
 import type { Asset } from '../types';
 import { Loader2 } from 'lucide-react';
 
+// Background uploads are still being processed after the upload returns
+const PROCESSING_POLL_INTERVAL_MS = 3000;
+
 export const DocumentsPage = () => {
     const [assets, setAssets] = useState<Asset[]>([]);
     const [loading, setLoading] = useState(true);
@@ -35,6 +38,14 @@ export const DocumentsPage = () => {
         fetchAssets();
     }, []);
 
+    const hasProcessing = assets.some(a => a.status === 'processing');
+
+    useEffect(() => {
+        if (!hasProcessing) return;
+        const timer = setInterval(fetchAssets, PROCESSING_POLL_INTERVAL_MS);
+        return () => clearInterval(timer);
+    }, [hasProcessing]);
+
     return (
         <div className="flex h-full flex-col overflow-y-auto bg-zinc-950 p-6 sm:p-10">
             <div className="mx-auto w-full max-w-5xl space-y-8">
@@ -10,11 +10,14 @@ export interface AuthResponse {
 
 export type AssetType = 'pdf' | 'docx' | 'image';
 
+export type AssetStatus = 'processing' | 'ready' | 'failed';
+
 export interface Asset {
     id: string;
     asset_type: AssetType;
     cloudinary_url: string;
     original_filename: string;
+    status: AssetStatus;
     created_at: string;
 }
 
@@ -32,12 +35,15 @@ export interface ChatSession {
     created_at: string;
     updated_at: string;
     message_count: number;
+    last_message_at: string | null;
     last_message: string | null;
 }
 
 export interface Source {
     asset_id: string;
     excerpt: string;
+    asset_filename?: string | null;
+    asset_url?: string | null;
 }
 
 export interface ChatResponse {